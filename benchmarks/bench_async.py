@@ -0,0 +1,215 @@
+"""Senkron handler'lar, async handler + threadpool ve async handler + özel DB executor karşılaştırması.
+
+Her mod için uygulama geçici bir veritabanıyla ayrı bir uvicorn sürecinde
+başlatılır ve yüksek eşzamanlılıkta redirect + shorten yükü uygulanır.
+
+    python benchmarks/bench_async.py --sync-rev <sürüm> --requests 20000
+    python benchmarks/bench_async.py --modes threadpool dedicated
+
+"sync" modu --sync-rev ile verilen sürümün git arşivini geçici bir dizine
+açıp onu çalıştırır; bu sürüm handler'ların hâlâ senkron olduğu son commit
+olmalıdır ("Add WAL and selectable SQLite PRAGMA profiles to init_db"
+commit'i; kısaltılmış hash rebase sonrası kaybolabileceğinden varsayılan
+yoktur, `git log --format=%H --grep "PRAGMA profiles"` ile bulunur). Her
+istek Starlette'ın ~40 thread'lik havuzunda senkron bir handler'dır. Diğer modlar çalışma
+kopyasını ya da --rev ile verilen sürümü çalıştırır. "threadpool" modu async
+handler'ların DB çağrılarını aynı havuza gönderir; "dedicated" modu tek
+yazıcı ve DB_READERS okuyucu thread kullanır.
+
+İstemci ve sunucu aynı makinede çalışır; tek çekirdekte istemci sunucuyla
+CPU paylaşır, bu yüzden mutlak değerler değil modlar arası fark anlamlıdır.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+
+def base62(n: int) -> str:
+    if n == 0:
+        return ALPHABET[0]
+    s = []
+    while n > 0:
+        n, r = divmod(n, 62)
+        s.append(ALPHABET[r])
+    return "".join(reversed(s))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed(db_path: Path, rows: int):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS urls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_url TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            clicks INTEGER DEFAULT 0
+        )
+    """)
+    now = datetime.utcnow().isoformat(" ")
+    conn.executemany(
+        "INSERT INTO urls (original_url, created_at, clicks) VALUES (?, ?, 0)",
+        ((f"https://example.com/seed/{i}", now) for i in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+def checkout(rev: str, target: Path) -> Path:
+    """rev'deki ağacı target dizinine açar (çalışma kopyasına dokunmaz)"""
+    archive = subprocess.run(["git", "archive", rev], cwd=ROOT, stdout=subprocess.PIPE, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target, filter="data")
+    return target
+
+
+def start_server(mode: str, db_path: Path, port: int, cwd: Path = ROOT) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=str(db_path), DB_EXECUTOR=mode)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "url_shortener:app",
+         "--port", str(port), "--log-level", "warning", "--backlog", "4096", "--timeout-keep-alive", "60"],
+        cwd=cwd, env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/stats/cache", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("uvicorn başlatılamadı")
+
+
+class Connection:
+    """Tek bir keep-alive HTTP/1.1 bağlantısı; istemci maliyeti httpx'in küçük bir kesri.
+
+    Sunucu ile aynı çekirdeği paylaşan istemci ne kadar ucuzsa ölçülen fark o
+    kadar sunucudan gelir.
+    """
+
+    def __init__(self, port: int):
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        head = f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Length: {len(body)}\r\n"
+        if body:
+            head += "Content-Type: application/json\r\n"
+        self.writer.write(head.encode() + b"\r\n" + body)
+        headers = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(headers[9:12])
+        length = 0
+        for line in headers.split(b"\r\n"):
+            if line[:15].lower() == b"content-length:":
+                length = int(line[15:])
+        if length:
+            await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def drive(port: int, rows: int, total: int, concurrency: int, write_ratio: float) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    every = int(1 / write_ratio) if write_ratio else 0
+
+    async def worker():
+        nonlocal errors
+        conn = Connection(port)
+        try:
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    if every and i % every == 0:
+                        body = json.dumps({"url": f"https://example.com/new/{i}"}).encode()
+                        status = await conn.request("POST", "/shorten", body)
+                    else:
+                        status = await conn.request("GET", "/" + base62(i % rows + 1))
+                except (OSError, asyncio.IncompleteReadError):
+                    errors += 1
+                    conn.close()
+                    conn = Connection(port)
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if status >= 400:
+                    errors += 1
+        finally:
+            conn.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    q = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": total / elapsed,
+        "p50_ms": q[49] * 1000,
+        "p95_ms": q[94] * 1000,
+        "p99_ms": q[98] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--modes", nargs="+", default=["sync", "threadpool", "dedicated"])
+    parser.add_argument("--sync-rev", help="sync modunda çalıştırılacak git sürümü (handler'ları senkron olan son commit)")
+    parser.add_argument("--rev", help="diğer modlarda çalışma kopyası yerine çalıştırılacak git sürümü")
+    args = parser.parse_args()
+    if "sync" in args.modes and not args.sync_rev:
+        parser.error("sync modu için --sync-rev gerekli (handler'ları hâlâ senkron olan son commit)")
+
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "bench.db"
+            seed(db_path, args.rows)
+            port = free_port()
+            rev = args.sync_rev if mode == "sync" else args.rev
+            cwd = checkout(rev, Path(tmp) / "src") if rev else ROOT
+            proc = start_server(mode, db_path, port, cwd)
+            try:
+                result = asyncio.run(drive(port, args.rows, args.requests, args.concurrency, args.write_ratio))
+            finally:
+                proc.terminate()
+                proc.wait()
+        print(
+            f"{mode:>10}: {result['rps']:8.0f} req/s  p50={result['p50_ms']:.1f}ms  "
+            f"p95={result['p95_ms']:.1f}ms  p99={result['p99_ms']:.1f}ms  errors={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
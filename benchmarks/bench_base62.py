@@ -0,0 +1,84 @@
+"""base62 / base62_decode mikro-benchmark'ı: eski doğrusal tarama sürümüne ve
+CODE_KEY ile açılan Feistel permütasyonlu kodlamaya karşı.
+
+    python benchmarks/bench_base62.py --n 100000
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import url_shortener
+from url_shortener import (
+    ALPHABET, CODE_ID_BITS, FeistelPermutation, base62, base62_decode, decode_id, encode_ids,
+)
+
+
+def base62_legacy(n: int) -> str:
+    if n == 0:
+        return ALPHABET[0]
+    s = []
+    b = len(ALPHABET)
+    while n > 0:
+        n, r = divmod(n, b)
+        s.append(ALPHABET[r])
+    return "".join(reversed(s))
+
+
+def base62_decode_legacy(code: str) -> int:
+    b = len(ALPHABET)
+    n = 0
+    for c in code:
+        n = n * b + ALPHABET.index(c)
+    return n
+
+
+def per_item_ns(fn, items, repeat: int) -> float:
+    best = min(timeit.repeat(lambda: fn(items), number=1, repeat=repeat))
+    return best / len(items) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--max-id", type=int, default=10**9)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ids = [random.randrange(1, args.max_id) for _ in range(args.n)]
+    codes = [base62_legacy(n) for n in ids]
+    assert [base62(n) for n in ids] == codes
+    assert [base62_decode(c) for c in codes] == ids
+
+    rows = [
+        ("encode eski", per_item_ns(lambda xs: [base62_legacy(n) for n in xs], ids, args.repeat)),
+        ("encode yeni", per_item_ns(lambda xs: [base62(n) for n in xs], ids, args.repeat)),
+        ("decode eski", per_item_ns(lambda xs: [base62_decode_legacy(c) for c in xs], codes, args.repeat)),
+        ("decode yeni", per_item_ns(lambda xs: [base62_decode(c) for c in xs], codes, args.repeat)),
+    ]
+
+    # Aynı id'ler anahtarlı permütasyonla: her kod 7 karakter, tersi tek geçişte
+    perm = FeistelPermutation(b"bench")
+    sample = random.sample(range(1 << CODE_ID_BITS), 1000)
+    assert len({perm.encrypt(n) for n in sample}) == len(sample)
+    assert all(perm.decrypt(perm.encrypt(n)) == n for n in sample)
+    plain_encode = per_item_ns(encode_ids, ids, args.repeat)
+    url_shortener.code_permutation = perm
+    try:
+        permuted = encode_ids(ids)
+        assert [decode_id(c) for c in permuted] == ids and {len(c) for c in permuted} == {7}
+        rows += [
+            ("encode_ids düz", plain_encode),
+            ("encode_ids permütasyon", per_item_ns(encode_ids, ids, args.repeat)),
+            ("decode_id permütasyon", per_item_ns(lambda xs: [decode_id(c) for c in xs], permuted, args.repeat)),
+        ]
+    finally:
+        url_shortener.code_permutation = None
+    for name, ns in rows:
+        print(f"{name:<23} {ns:8.1f} ns/kod")
+
+
+if __name__ == "__main__":
+    main()
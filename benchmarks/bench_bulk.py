@@ -0,0 +1,53 @@
+"""Tekil POST /shorten ile POST /shorten/bulk arasındaki verim karşılaştırması.
+
+Uygulama geçici bir veritabanıyla süreç içinde (TestClient) çalıştırılır.
+
+    python benchmarks/bench_bulk.py --urls 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=20000)
+    parser.add_argument("--single", type=int, default=2000, help="tekil istek sayısı")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = str(Path(tmp) / "bench.db")
+    sys.path.insert(0, str(ROOT))
+    import url_shortener
+    from fastapi.testclient import TestClient
+
+    with TestClient(url_shortener.app) as client:
+        start = time.perf_counter()
+        for i in range(args.single):
+            client.post("/shorten", json={"url": f"https://example.com/single/{i}"})
+        single = args.single / (time.perf_counter() - start)
+
+        urls = [f"https://example.com/bulk/{i}?utm_source=campaign" for i in range(args.urls)]
+        start = time.perf_counter()
+        res = client.post("/shorten/bulk", json=urls)
+        lines = res.text.count("\n")
+        bulk = args.urls / (time.perf_counter() - start)
+        assert lines == args.urls, lines
+
+        # Aynı listeyi tekrar göndermek yalnızca dedup yolunu ölçer
+        start = time.perf_counter()
+        client.post("/shorten/bulk", json=urls)
+        dedup = args.urls / (time.perf_counter() - start)
+
+    print(f"tekil /shorten     : {single:10.0f} URL/s")
+    print(f"/shorten/bulk yeni : {bulk:10.0f} URL/s  ({bulk / single:.1f}x)")
+    print(f"/shorten/bulk dedup: {dedup:10.0f} URL/s")
+
+
+if __name__ == "__main__":
+    main()
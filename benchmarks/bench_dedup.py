@@ -0,0 +1,107 @@
+"""original_url üzerindeki UNIQUE metin indeksi ile url_hash indeksinin karşılaştırması.
+
+Uzun izleme URL'leriyle iki veritabanı oluşturulur; dosya/indeks boyutu ve
+dedup sorgusunun (mevcut ve olmayan URL) gecikmesi raporlanır.
+
+    python benchmarks/bench_dedup.py --rows 100000 --url-length 2000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from url_shortener import normalize_url, url_hash
+
+
+def tracking_url(i: int, length: int, rng: random.Random) -> str:
+    base = f"https://shop.example.com/campaign/{i}?utm_source=mail&utm_medium=email&ref="
+    return base + "".join(rng.choices(string.ascii_letters + string.digits, k=max(0, length - len(base))))
+
+
+def build(path: str, urls: list, mode: str):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE urls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_url TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            clicks INTEGER DEFAULT 0,
+            url_hash INTEGER
+        )
+    """)
+    if mode == "text":
+        conn.execute("CREATE UNIQUE INDEX idx_original_url ON urls(original_url)")
+        rows = ((url, None) for url in urls)
+    else:
+        conn.execute("CREATE INDEX idx_url_hash ON urls(url_hash)")
+        rows = ((url, url_hash(normalize_url(url))) for url in urls)
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO urls (original_url, url_hash, created_at) VALUES (?, ?, '2025-01-01')", rows
+    )
+    conn.commit()
+    insert_s = time.perf_counter() - start
+    conn.close()
+    return insert_s
+
+
+def index_bytes(conn: sqlite3.Connection, name: str):
+    try:
+        row = conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = ?", (name,)).fetchone()
+        return row[0]
+    except sqlite3.OperationalError:
+        return None
+
+
+def lookup_us(conn: sqlite3.Connection, urls: list, mode: str) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        if mode == "text":
+            conn.execute("SELECT id FROM urls WHERE original_url = ?", (url,)).fetchone()
+        else:
+            key = normalize_url(url)
+            for _, candidate in conn.execute(
+                "SELECT id, original_url FROM urls WHERE url_hash = ?", (url_hash(key),)
+            ):
+                if candidate == url or normalize_url(candidate) == key:
+                    break
+    return (time.perf_counter() - start) / len(urls) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--url-length", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    urls = [tracking_url(i, args.url_length, rng) for i in range(args.rows)]
+    hits = rng.sample(urls, min(args.lookups, len(urls)))
+    misses = [tracking_url(args.rows + i, args.url_length, rng) for i in range(len(hits))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, index in (("text", "idx_original_url"), ("hash", "idx_url_hash")):
+            path = os.path.join(tmp, f"{mode}.db")
+            insert_s = build(path, urls, mode)
+            conn = sqlite3.connect(path)
+            idx = index_bytes(conn, index)
+            hit = lookup_us(conn, hits, mode)
+            miss = lookup_us(conn, misses, mode)
+            conn.close()
+            print(
+                f"{mode:>4}: dosya={os.path.getsize(path) / 2**20:7.1f} MiB  "
+                f"indeks={'?' if idx is None else f'{idx / 2**20:.1f}'} MiB  "
+                f"ekleme={args.rows / insert_s:8.0f} satır/s  "
+                f"bulunan={hit:6.1f} µs  bulunmayan={miss:6.1f} µs"
+            )
+
+
+if __name__ == "__main__":
+    main()
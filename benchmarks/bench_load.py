@@ -0,0 +1,259 @@
+"""Redirect ve shorten sıcak yolları için yük testi.
+
+Uygulama geçici bir veritabanıyla ya aynı süreçte (ASGI transport) ya da ayrı
+bir uvicorn sürecinde başlatılır. Veritabanı N satırla doldurulur, ardından
+iki iş yükü uygulanır:
+
+- redirect: Zipf dağılımlı kodlara GET (az sayıda sıcak link, uzun kuyruk)
+- mixed:    aynı redirect trafiği + --write-ratio oranında POST /api/shorten
+            (yazmaların --dup-ratio kadarı mevcut URL'ler, yani dedup yolu)
+
+Her iş yükü için RPS ve p50/p95/p99 gecikme raporlanır; sonuçlar zaman içinde
+karşılaştırılabilsin diye JSON olarak kaydedilir.
+
+    python benchmarks/bench_load.py --rows 1000000 --server uvicorn --workers 2
+    python benchmarks/bench_load.py --rows 100000 --compare benchmarks/results/onceki.json
+
+Depolama ayarları (STORAGE_BACKEND, DB_SHARDS, SQLITE_PROFILE, ...) ortamdan
+okunur ve sunucuya aynen aktarılır.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SEED_CHUNK = 5000
+# Sonuç dosyasına yazılan, performansı etkileyen ortam değişkenleri
+TRACKED_ENV = (
+    "STORAGE_BACKEND", "DB_SHARDS", "SQLITE_PROFILE", "DB_EXECUTOR", "DB_READERS",
+    "DB_POOL_SIZE", "REDIRECT_CACHE_SIZE", "ID_BLOCK_SIZE",
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed(app_module, rows: int):
+    """Uygulamanın kendi depolama motoruyla rows adet URL ekler, id listesini döndürür"""
+    storage = app_module.storage
+    storage.init()
+    ids = []
+    started = time.perf_counter()
+    for start in range(0, rows, SEED_CHUNK):
+        urls = [f"https://example.com/seed/{i}" for i in range(start, min(rows, start + SEED_CHUNK))]
+        created = storage.bulk_create(urls)
+        ids.extend(created[url] for url in urls)
+    print(f"{rows} satır {time.perf_counter() - started:.1f} s'de eklendi", file=sys.stderr)
+    return ids
+
+
+def zipf_codes(app_module, ids: list, count: int, s: float, rng: random.Random) -> list:
+    """Zipf(s) sıralı popülerliğe göre kod dizisi; sıcak id'ler id uzayına karıştırılır"""
+    order = ids[:]
+    rng.shuffle(order)
+    cum_weights = list(itertools.accumulate(1 / rank ** s for rank in range(1, len(order) + 1)))
+    picks = rng.choices(order, cum_weights=cum_weights, k=count)
+    return [app_module.encode_id(url_id) for url_id in picks]
+
+
+def build_plan(codes: list, rows: int, write_ratio: float, dup_ratio: float, rng: random.Random) -> list:
+    plan = []
+    for i, code in enumerate(codes):
+        if rng.random() < write_ratio:
+            if rng.random() < dup_ratio:
+                url = f"https://example.com/seed/{rng.randrange(rows)}"
+            else:
+                url = f"https://example.com/new/{i}/{rng.getrandbits(32):x}"
+            plan.append(("shorten", url))
+        else:
+            plan.append(("redirect", code))
+    return plan
+
+
+async def drive(client: httpx.AsyncClient, plan: list, concurrency: int) -> dict:
+    latencies = {"redirect": [], "shorten": []}
+    errors = 0
+    steps = iter(plan)
+
+    async def worker():
+        nonlocal errors
+        for op, arg in steps:
+            start = time.perf_counter()
+            try:
+                if op == "redirect":
+                    res = await client.get("/" + arg)
+                else:
+                    res = await client.post("/api/shorten", json={"url": arg})
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies[op].append(time.perf_counter() - start)
+            if res.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = {"requests": len(plan), "seconds": elapsed, "rps": len(plan) / elapsed, "errors": errors}
+    for op, values in latencies.items():
+        if len(values) >= 2:
+            q = statistics.quantiles(values, n=100)
+            result[op] = {
+                "count": len(values),
+                "p50_ms": q[49] * 1000, "p95_ms": q[94] * 1000, "p99_ms": q[98] * 1000,
+            }
+    return result
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "url_shortener:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--backlog", "4096",
+         "--timeout-keep-alive", "60"],
+        cwd=ROOT, env=dict(os.environ),
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/stats/cache", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("uvicorn başlatılamadı")
+
+
+async def run_workloads(client: httpx.AsyncClient, plans: dict, concurrency: int, warmup: int) -> dict:
+    results = {}
+    for name, plan in plans.items():
+        # Isınma turu: thread'lerin açılması ve önbelleğin dolması ölçüme karışmasın
+        await drive(client, plan[:warmup], concurrency)
+        results[name] = await drive(client, plan, concurrency)
+    return results
+
+
+async def run_inprocess(app_module, plans: dict, concurrency: int, warmup: int) -> dict:
+    app = app_module.app
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_workloads(client, plans, concurrency, warmup)
+
+
+async def run_uvicorn(port: int, plans: dict, concurrency: int, warmup: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        return await run_workloads(client, plans, concurrency, warmup)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: dict, baseline=None):
+    for name, result in results.items():
+        line = f"{name:>9}: {result['rps']:8.0f} req/s  hata={result['errors']}"
+        for op in ("redirect", "shorten"):
+            if op in result:
+                r = result[op]
+                line += f"  {op}: p50={r['p50_ms']:.2f} p95={r['p95_ms']:.2f} p99={r['p99_ms']:.2f} ms"
+        print(line)
+        old = (baseline or {}).get(name)
+        if old:
+            change = (result["rps"] / old["rps"] - 1) * 100
+            print(f"{'':>11}önceki: {old['rps']:8.0f} req/s ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker sayısı")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=50000, help="iş yükü başına istek")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--warmup", type=int, default=1000, help="ölçülmeyen ısınma isteği")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf üssü s")
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--dup-ratio", type=float, default=0.2)
+    parser.add_argument("--workloads", nargs="+", choices=("redirect", "mixed"), default=["redirect", "mixed"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", type=Path, help="JSON dosyası (varsayılan: benchmarks/results/load-<zaman>.json)")
+    parser.add_argument("--compare", type=Path, help="karşılaştırılacak önceki JSON sonucu")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = str(Path(tmp) / "bench.db")
+        if args.server == "uvicorn" and os.environ.get("STORAGE_BACKEND") == "memory":
+            parser.error("memory motoru ayrı bir uvicorn sürecine tohumlanamaz; --server inprocess kullanın")
+        sys.path.insert(0, str(ROOT))
+        import url_shortener
+
+        rng = random.Random(args.seed)
+        ids = seed(url_shortener, args.rows)
+        codes = zipf_codes(url_shortener, ids, args.requests, args.zipf, rng)
+        plans = {}
+        if "redirect" in args.workloads:
+            plans["redirect"] = [("redirect", code) for code in codes]
+        if "mixed" in args.workloads:
+            plans["mixed"] = build_plan(codes, args.rows, args.write_ratio, args.dup_ratio, rng)
+
+        if args.server == "inprocess":
+            results = asyncio.run(run_inprocess(url_shortener, plans, args.concurrency, args.warmup))
+        else:
+            url_shortener.storage.close()
+            port = free_port()
+            proc = start_server(port, args.workers)
+            try:
+                results = asyncio.run(run_uvicorn(port, plans, args.concurrency, args.warmup))
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    now = datetime.now(timezone.utc)
+    document = {
+        "label": args.label,
+        "timestamp": now.isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        "env": {name: os.environ[name] for name in TRACKED_ENV if name in os.environ},
+        "results": results,
+    }
+    baseline = json.loads(args.compare.read_text())["results"] if args.compare else None
+    report(results, baseline)
+
+    output = args.output or RESULTS_DIR / f"load-{now:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n")
+    print(f"sonuçlar: {output}")
+
+
+if __name__ == "__main__":
+    main()
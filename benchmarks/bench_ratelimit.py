@@ -0,0 +1,123 @@
+"""Hız sınırlayıcının istek başına ek maliyeti ve kova belleği.
+
+- TokenBuckets.hit: anahtar sayısına göre çağrı başına süre
+- RateLimitMiddleware: boş bir ASGI uygulamasının önünde, route eşleme ve
+  istemci anahtarı dahil istek başına ek süre (sınırsız route, tek bir sabit
+  kod ve her istekte farklı kodlar; gerçek yönlendirme trafiği sonuncusudur)
+- Anahtar başına bellek ve boşta kova temizliği süresi
+- SQLite ortak durum: çağrı başına süre
+
+    python benchmarks/bench_ratelimit.py --keys 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", str(Path(tempfile.gettempdir()) / "bench_ratelimit.db"))
+from url_shortener import RateLimitMiddleware, SharedTokenBuckets, TokenBuckets, encode_id
+
+ROUNDS = 5
+
+
+def per_call_ns(fn, n: int) -> float:
+    start = time.perf_counter()
+    fn(n)
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def bench_buckets(keys: int, n: int):
+    buckets = TokenBuckets(rate=1e9, burst=10**9)
+    names = [f"10.0.{i >> 8 & 255}.{i & 255}:{i}" for i in range(keys)]
+    now = time.time()
+
+    def run(count):
+        hit = buckets.hit
+        for i in range(count):
+            hit(names[i % keys], now)
+    return per_call_ns(run, n)
+
+
+def bench_middleware(n: int) -> dict:
+    async def empty_app(scope, receive, send):
+        pass
+
+    limiter = RateLimitMiddleware(empty_app, rules={"redirect_url": (1e9, 10**9)})
+
+    def scope(path):
+        return {"type": "http", "method": "GET", "path": path, "headers": [], "client": ("10.0.0.1", 1)}
+    # Her tur yeni kodlar görür; route önbelleği bu yolları hiç görmemiştir
+    unique = iter(scope("/" + encode_id(i)) for i in range(1, n * (ROUNDS * 2 + 1) + 1))
+    workloads = {
+        "sınırsız route": lambda: [scope("/api/urls")] * n,
+        "sınırlı route, sabit kod": lambda: [scope("/abc")] * n,
+        "sınırlı route, farklı kodlar": lambda: [next(unique) for _ in range(n)],
+    }
+
+    async def run(app, scopes):
+        start = time.perf_counter()
+        for item in scopes:
+            await app(item, None, None)
+        return (time.perf_counter() - start) / len(scopes) * 1e9
+
+    async def main():
+        result = {}
+        for name, make in workloads.items():
+            await run(limiter, make()[:1000])
+            # Gürültüye karşı en iyi turlar karşılaştırılır
+            base = min([await run(empty_app, make()) for _ in range(ROUNDS)])
+            result[name] = min([await run(limiter, make()) for _ in range(ROUNDS)]) - base
+        return result
+    return asyncio.run(main())
+
+
+def bench_memory(keys: int):
+    buckets = TokenBuckets(rate=1.0, burst=10)
+    names = [f"10.0.{i >> 8 & 255}.{i & 255}:{i}" for i in range(keys)]
+    now = time.time()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for name in names:
+        buckets.hit(name, now)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    start = time.perf_counter()
+    buckets.sweep(now + 60)
+    return used / keys, (time.perf_counter() - start) * 1000, len(buckets.tats)
+
+
+def bench_shared(n: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        buckets = SharedTokenBuckets(str(Path(tmp) / "rl.db"), "redirect_url", rate=1e9, burst=10**9)
+        now = time.time()
+
+        def run(count):
+            for i in range(count):
+                buckets.hit(f"10.0.0.{i % 256}", now)
+        result = per_call_ns(run, n)
+        buckets.conn.close()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=500000)
+    args = parser.parse_args()
+
+    for keys in (1, 1000, args.keys):
+        print(f"TokenBuckets.hit ({keys:>7} anahtar): {bench_buckets(keys, args.calls):7.0f} ns/çağrı")
+    for name, ns in bench_middleware(args.calls // 5).items():
+        print(f"middleware ek maliyeti ({name}): {ns:7.0f} ns/istek")
+    per_key, sweep_ms, left = bench_memory(args.keys)
+    print(f"bellek: {per_key:.0f} bayt/anahtar  boşta {args.keys} kovanın temizliği: {sweep_ms:.1f} ms (kalan {left})")
+    print(f"SQLite ortak durum: {bench_shared(args.calls // 50) / 1000:7.1f} µs/çağrı")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Salt okunur snapshot motoru: yükleme süresi, milyon link başına bellek ve okuma hızı.
+
+Geçici bir SQLite veritabanı --rows satırla doldurulur, ardından:
+
+- SnapshotStorage'ın dosyayı yükleme süresi ve ofset tablosu + blob boyutu
+- yükleme sırasındaki tepe bellek artışı (ru_maxrss)
+- rastgele id'lerle get_by_id: snapshot ve SQLiteStorage
+
+    python benchmarks/bench_snapshot.py --rows 1000000
+"""
+import argparse
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from url_shortener import SnapshotStorage, SQLiteStorage
+
+SEED_CHUNK = 5000
+
+
+def seed(path: Path, rows: int, url_length: int) -> list:
+    storage = SQLiteStorage(path)
+    storage.init()
+    ids = []
+    pad = "x" * max(0, url_length - len("https://example.com/seed/0000000/"))
+    for start in range(0, rows, SEED_CHUNK):
+        urls = [f"https://example.com/seed/{i:07d}/{pad}" for i in range(start, min(rows, start + SEED_CHUNK))]
+        created = storage.bulk_create(urls)
+        ids.extend(created[url] for url in urls)
+    storage.close()
+    return ids
+
+
+def lookup_ns(get, sample: list) -> float:
+    start = time.perf_counter()
+    for url_id in sample:
+        get(url_id)
+    return (time.perf_counter() - start) / len(sample) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--url-length", type=int, default=60, help="ortalama URL uzunluğu (bayt)")
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        started = time.perf_counter()
+        ids = seed(path, args.rows, args.url_length)
+        print(f"{args.rows} satır {time.perf_counter() - started:.1f} s'de eklendi")
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        snapshot = SnapshotStorage(path)
+        snapshot.init()
+        rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+        stats = snapshot.stats()
+        per_million = stats["bytes_per_million_links"] / 2**20
+        print(f"yükleme: {stats['load_seconds']:.2f} s  ({args.rows / stats['load_seconds']:,.0f} link/s)")
+        print(
+            f"bellek: {stats['bytes'] / 2**20:.1f} MiB, {per_million:.1f} MiB / milyon link "
+            f"(URL'ler {args.url_length} bayt; yükleme tepe RSS artışı {rss_peak / 1024:.0f} MiB)"
+        )
+
+        rng = random.Random(42)
+        sample = [rng.choice(ids) for _ in range(args.lookups)]
+        sqlite = SQLiteStorage(path)
+        sqlite.init()
+        try:
+            for name, get in (("snapshot", snapshot.get_by_id), ("sqlite", sqlite.get_by_id)):
+                assert get(sample[0])[0].startswith("https://example.com/seed/")
+                print(f"get_by_id {name:>8}: {lookup_ns(get, sample):8.0f} ns/okuma")
+        finally:
+            sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
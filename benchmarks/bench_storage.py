@@ -0,0 +1,168 @@
+"""Depolama motorları için uyumluluk kontrolü ve benchmark.
+
+Her motor önce aynı davranış senaryosundan geçirilir (dedup, toplu ekleme,
+sayfalama, tıklama sayaçları, özetler, silme); ardından tekli ekleme, toplu
+ekleme, id ile okuma ve sayfalama süreleri ölçülür.
+
+    python benchmarks/bench_storage.py --rows 20000
+    python benchmarks/bench_storage.py --engines memory --check-only
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from url_shortener import MemoryStorage, ShardedStorage, SQLiteStorage
+
+ENGINES = {
+    "sqlite": lambda tmp: SQLiteStorage(Path(tmp) / "bench.db"),
+    "sharded": lambda tmp: ShardedStorage(Path(tmp) / "bench.db", 4),
+    "memory": lambda tmp: MemoryStorage(),
+}
+
+
+def check(storage):
+    """Protokolün tüm motorlarda aynı davrandığını doğrular"""
+    a = storage.get_or_create("https://Example.com:443/a?y=2&x=1")
+    assert storage.get_or_create("https://example.com/a?x=1&y=2") == a, "normalize edilmiş URL tekrar eklendi"
+    assert storage.get_by_id(a) == ("https://Example.com:443/a?y=2&x=1", None)
+    assert storage.get_by_id(a + 1000) is None
+
+    urls = ["https://example.com/b", "https://example.com/c", "https://example.com/b", "https://example.com/a?x=1&y=2"]
+    ids = storage.bulk_create(urls)
+    assert set(ids) == set(urls), "bulk_create her URL için id döndürmeli"
+    assert ids["https://example.com/a?x=1&y=2"] == a
+    b, c = ids["https://example.com/b"], ids["https://example.com/c"]
+    assert len({a, b, c}) == 3
+    # Shard'lı motorda id'ler URL'ye göre dağıldığından sıra id üzerinden beklenir
+    desc = sorted((a, b, c), reverse=True)
+
+    page = storage.list_page(None, 2)
+    assert [row[0] for row in page] == desc[:2], "sayfalama id DESC olmalı"
+    assert [row[0] for row in storage.list_page(desc[1], 10)] == desc[2:]
+    assert all(len(row) == 6 for row in page)
+
+    storage.incr_clicks({a: 3, c: 1})
+    storage.incr_clicks({a: 2})
+    clicks = {row[0]: row[3] for row in storage.list_page(None, 10)}
+    assert clicks == {a: 5, b: 0, c: 1}, clicks
+
+    storage.record_clicks(
+        [(a, 120.0, "example.org", "desktop"), (a, 130.0, None, "bot")],
+        {"minute": {(a, 120): 2}, "hour": {(a, 0): 2}, "day": {(a, 0): 2}},
+    )
+    storage.record_clicks([(a, 125.0, None, "mobile")], {"minute": {(a, 120): 1}})
+    assert storage.click_series(a, "minute", 0, 600) == [(120, 3)]
+    assert storage.click_series(a, "minute", 0, 120) == []
+    assert storage.click_series(b, "hour", 0, 3600) == []
+    assert storage.click_series(c + 1000, "hour", 0, 3600) is None
+
+    assert storage.delete(b) is True
+    assert storage.delete(b) is False
+    assert storage.get_by_id(b) is None
+    assert [row[0] for row in storage.list_page(None, 10)] == sorted((a, c), reverse=True)
+    assert storage.delete(a) is True
+    assert storage.click_series(a, "minute", 0, 600) is None
+    assert storage.get_or_create("https://example.com/a?x=1&y=2") not in (a, b, c), "silinen id tekrar kullanılmamalı"
+
+    # Süreli linkler dedup'a girmez; reaper yalnızca süresi dolanları siler
+    now = time.time()
+    d = storage.get_or_create("https://example.com/c", now - 1)
+    e = storage.get_or_create("https://example.com/c", now + 3600)
+    assert len({c, d, e}) == 3, "süreli link başka bir linkle birleştirildi"
+    assert storage.get_or_create("https://example.com/c") == c
+    assert storage.get_by_id(e) == ("https://example.com/c", now + 3600)
+    assert storage.expired_count(now) == 1
+    assert storage.reap_expired(now, 10) == [d]
+    assert storage.get_by_id(d) is None and storage.get_by_id(e) is not None
+    assert storage.expired_count(now) == 0 and storage.reap_expired(now, 10) == []
+
+    # Takma ad ayrı bir satırdır; ad ikinci kez alınamaz, silme ve reaper adı serbest bırakır
+    f = storage.create_alias("https://example.com/c", "yaz-indirimi")
+    assert f not in (c, e) and storage.create_alias("https://example.com/x", "yaz-indirimi") is None
+    assert storage.get_alias("yaz-indirimi") == f and storage.get_alias("kis-indirimi") is None
+    assert storage.get_by_id(f) == ("https://example.com/c", None)
+    assert {row[0]: row[5] for row in storage.list_page(None, 10)}[f] == "yaz-indirimi"
+    # Takma adlı satır dedup'a girmez; aynı URL'nin düz isteği ona bağlanmaz
+    h = storage.create_alias("https://example.com/p", "vanity-one")
+    assert storage.get_or_create("https://example.com/p") != h, "düz istek takma adlı satıra bağlandı"
+    assert h not in storage.bulk_create(["https://example.com/p"]).values()
+    assert storage.delete(h) and storage.get_alias("vanity-one") is None
+    assert storage.delete(f) and storage.get_alias("yaz-indirimi") is None
+    g = storage.create_alias("https://example.com/c", "yaz-indirimi", now - 1)
+    assert storage.reap_expired(now, 10) == [g] and storage.get_alias("yaz-indirimi") is None
+
+
+def timed(fn, n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def bench(storage, rows: int, lookups: int, rng: random.Random) -> dict:
+    singles = [f"https://example.com/single/{i}" for i in range(rows // 10)]
+    bulk = [f"https://example.com/bulk/{i}" for i in range(rows)]
+    result = {
+        "get_or_create": timed(lambda: [storage.get_or_create(url) for url in singles], len(singles)),
+        "bulk_create": timed(
+            lambda: [storage.bulk_create(bulk[i:i + 500]) for i in range(0, rows, 500)], rows
+        ),
+    }
+    # Uygulamadaki gibi shard başına bir yazıcı thread; tek dosyalı motorlarda tek thread
+    parallel = [f"https://example.com/parallel/{i}" for i in range(rows // 10)]
+    groups = storage.partition(parallel)
+
+    def write_parallel():
+        with ThreadPoolExecutor(len(groups)) as pool:
+            list(pool.map(lambda group: [storage.get_or_create(url) for url in group], groups.values()))
+    result["get_or_create_writers"] = timed(write_parallel, len(parallel))
+    ids = [row[0] for row in storage.list_page(None, rows * 2)]
+    sample = [rng.choice(ids) for _ in range(lookups)]
+    result["get_by_id"] = timed(lambda: [storage.get_by_id(url_id) for url_id in sample], lookups)
+
+    def walk():
+        after = None
+        while True:
+            page = storage.list_page(after, 100)
+            if not page:
+                return
+            after = page[-1][0]
+    result["list_page"] = timed(walk, len(ids))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=50000)
+    parser.add_argument("--check-only", action="store_true")
+    args = parser.parse_args()
+
+    for name in args.engines.split(","):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = ENGINES[name](tmp)
+            storage.init()
+            try:
+                check(storage)
+                print(f"{name:>6}: uyumluluk kontrolü geçti")
+            finally:
+                storage.close()
+        if args.check_only:
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = ENGINES[name](tmp)
+            storage.init()
+            try:
+                result = bench(storage, args.rows, args.lookups, random.Random(42))
+            finally:
+                storage.close()
+        print("        " + "  ".join(f"{op}={rate:9.0f} işlem/s" for op, rate in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+// Translations
+const translations = {
+  en: {
+    title: '✨ URL Shortener Pro',
+    subtitle: 'Shorten long links instantly • Generate QR codes • Track statistics',
+    inputPlaceholder: 'https://example.com/very-long-url-here...',
+    shortenBtn: '🚀 Shorten',
+    allUrls: '📊 All URLs',
+    refreshBtn: '🔄 Refresh',
+    processing: 'Processing...',
+    pleaseEnterUrl: '❌ Please enter a URL',
+    error: 'Error',
+    shortUrl: 'Short URL:',
+    copy: '📋 Copy',
+    copied: '✅ Copied!',
+    delete: '🗑️',
+    clicks: 'clicks',
+    noUrls: 'No shortened URLs yet.',
+    startMessage: 'Add a URL from above to get started! 🚀',
+    deleteConfirm: 'Are you sure you want to delete this URL?',
+    deleteError: '❌ Could not delete',
+    copyError: '❌ Could not copy',
+    loadMore: '⬇️ Load more'
+  },
+  tr: {
+    title: '✨ URL Kısaltıcı Pro',
+    subtitle: 'Uzun linkleri anında kısalt • QR kod üret • İstatistik tut',
+    inputPlaceholder: 'https://ornek.com/cok-uzun-bir-url-buraya...',
+    shortenBtn: '🚀 Kısalt',
+    allUrls: '📊 Tüm URLler',
+    refreshBtn: '🔄 Yenile',
+    processing: 'İşleniyor...',
+    pleaseEnterUrl: '❌ Lütfen bir URL girin',
+    error: 'Hata',
+    shortUrl: 'Kısa URL:',
+    copy: '📋 Kopyala',
+    copied: '✅ Kopyalandı!',
+    delete: '🗑️',
+    clicks: 'tıklama',
+    noUrls: 'Henüz kısaltılmış URL yok.',
+    startMessage: 'Yukarıdan bir URL ekleyerek başlayın! 🚀',
+    deleteConfirm: 'Bu URLi silmek istediğinizden emin misiniz?',
+    deleteError: '❌ Silinemedi',
+    copyError: '❌ Kopyalanamadı',
+    loadMore: '⬇️ Daha fazla yükle'
+  },
+  de: {
+    title: '✨ URL-Kürzer Pro',
+    subtitle: 'Lange Links sofort kürzen • QR-Codes generieren • Statistiken verfolgen',
+    inputPlaceholder: 'https://beispiel.com/sehr-lange-url-hier...',
+    shortenBtn: '🚀 Kürzen',
+    allUrls: '📊 Alle URLs',
+    refreshBtn: '🔄 Aktualisieren',
+    processing: 'Wird verarbeitet...',
+    pleaseEnterUrl: '❌ Bitte geben Sie eine URL ein',
+    error: 'Fehler',
+    shortUrl: 'Kurz-URL:',
+    copy: '📋 Kopieren',
+    copied: '✅ Kopiert!',
+    delete: '🗑️',
+    clicks: 'Klicks',
+    noUrls: 'Noch keine gekürzten URLs.',
+    startMessage: 'Fügen Sie oben eine URL hinzu, um zu beginnen! 🚀',
+    deleteConfirm: 'Sind Sie sicher, dass Sie diese URL löschen möchten?',
+    deleteError: '❌ Konnte nicht gelöscht werden',
+    copyError: '❌ Konnte nicht kopiert werden',
+    loadMore: '⬇️ Mehr laden'
+  }
+};
+
+// Language management
+let currentLang = localStorage.getItem('lang') || 'en';
+
+function changeLang(lang) {
+  currentLang = lang;
+  localStorage.setItem('lang', lang);
+  updateLanguage();
+  playSound('click');
+}
+
+function updateLanguage() {
+  const t = translations[currentLang];
+
+  // Update all elements with data-i18n attribute
+  document.querySelectorAll('[data-i18n]').forEach(el => {
+    const key = el.getAttribute('data-i18n');
+    if (t[key]) el.textContent = t[key];
+  });
+
+  // Update placeholder
+  const input = document.getElementById('url');
+  if (input) input.placeholder = t.inputPlaceholder;
+
+  // Update active language button
+  document.querySelectorAll('.lang-btn').forEach(btn => {
+    btn.classList.toggle('active', btn.getAttribute('data-lang') === currentLang);
+  });
+
+  // Reload list to update translations
+  if (document.getElementById('list').children.length > 0) {
+    loadAll();
+  }
+}
+
+// Theme management
+let theme = localStorage.getItem('theme') || 'light';
+document.documentElement.dataset.theme = theme;
+updateThemeIcon();
+
+function toggleTheme() {
+  theme = theme === 'dark' ? 'light' : 'dark';
+  document.documentElement.dataset.theme = theme;
+  localStorage.setItem('theme', theme);
+  updateThemeIcon();
+  playSound('click');
+}
+
+function updateThemeIcon() {
+  document.getElementById('theme-icon').textContent = theme === 'dark' ? '☀️' : '🌙';
+}
+
+// Initialize language on load
+updateLanguage();
+
+// Generate floating particles
+function createParticles() {
+  const container = document.getElementById('particles');
+  for (let i = 0; i < 15; i++) {
+    const particle = document.createElement('div');
+    particle.className = 'particle';
+    particle.style.left = Math.random() * 100 + '%';
+    particle.style.top = Math.random() * 100 + '%';
+    particle.style.animationDelay = Math.random() * 20 + 's';
+    particle.style.animationDuration = (15 + Math.random() * 10) + 's';
+    container.appendChild(particle);
+  }
+}
+createParticles();
+
+// Sound Effects System
+let audioContext;
+try {
+  audioContext = new (window.AudioContext || window.webkitAudioContext)();
+} catch(e) {
+  console.warn('Audio not supported:', e);
+}
+
+function playSound(type) {
+  if (!audioContext) return;
+
+  try {
+    const oscillator = audioContext.createOscillator();
+    const gainNode = audioContext.createGain();
+
+  oscillator.connect(gainNode);
+  gainNode.connect(audioContext.destination);
+
+  switch(type) {
+    case 'success':
+      // Başarı sesi - yükselen notalar
+      oscillator.frequency.setValueAtTime(523.25, audioContext.currentTime); // C5
+      oscillator.frequency.setValueAtTime(659.25, audioContext.currentTime + 0.1); // E5
+      oscillator.frequency.setValueAtTime(783.99, audioContext.currentTime + 0.2); // G5
+      gainNode.gain.setValueAtTime(0.3, audioContext.currentTime);
+      gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.4);
+      oscillator.start(audioContext.currentTime);
+      oscillator.stop(audioContext.currentTime + 0.4);
+      break;
+
+    case 'copy':
+      // Kopyalama sesi - kısa bip
+      oscillator.frequency.setValueAtTime(800, audioContext.currentTime);
+      oscillator.type = 'sine';
+      gainNode.gain.setValueAtTime(0.2, audioContext.currentTime);
+      gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.15);
+      oscillator.start(audioContext.currentTime);
+      oscillator.stop(audioContext.currentTime + 0.15);
+      break;
+
+    case 'delete':
+      // Silme sesi - düşen notalar
+      oscillator.frequency.setValueAtTime(600, audioContext.currentTime);
+      oscillator.frequency.exponentialRampToValueAtTime(200, audioContext.currentTime + 0.3);
+      oscillator.type = 'sawtooth';
+      gainNode.gain.setValueAtTime(0.15, audioContext.currentTime);
+      gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.3);
+      oscillator.start(audioContext.currentTime);
+      oscillator.stop(audioContext.currentTime + 0.3);
+      break;
+
+    case 'error':
+      // Hata sesi - düşük titreşim
+      oscillator.frequency.setValueAtTime(150, audioContext.currentTime);
+      oscillator.type = 'sawtooth';
+      gainNode.gain.setValueAtTime(0.2, audioContext.currentTime);
+      gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.4);
+      oscillator.start(audioContext.currentTime);
+      oscillator.stop(audioContext.currentTime + 0.4);
+      break;
+
+    case 'click':
+      // Tıklama sesi - kısa patlama
+      oscillator.frequency.setValueAtTime(400, audioContext.currentTime);
+      oscillator.type = 'square';
+      gainNode.gain.setValueAtTime(0.1, audioContext.currentTime);
+      gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.05);
+      oscillator.start(audioContext.currentTime);
+      oscillator.stop(audioContext.currentTime + 0.05);
+      break;
+  }
+  } catch(e) {
+    console.warn('Sound error:', e);
+  }
+}
+
+// Confetti effect for success
+function createConfetti() {
+  const colors = ['#667eea', '#764ba2', '#f093fb', '#f5576c', '#4facfe', '#00f2fe'];
+  const confettiCount = 50;
+
+  for (let i = 0; i < confettiCount; i++) {
+    const confetti = document.createElement('div');
+    confetti.style.position = 'fixed';
+    confetti.style.width = '10px';
+    confetti.style.height = '10px';
+    confetti.style.backgroundColor = colors[Math.floor(Math.random() * colors.length)];
+    confetti.style.left = Math.random() * 100 + '%';
+    confetti.style.top = '-10px';
+    confetti.style.borderRadius = Math.random() > 0.5 ? '50%' : '0';
+    confetti.style.opacity = '1';
+    confetti.style.zIndex = '9999';
+    confetti.style.pointerEvents = 'none';
+    document.body.appendChild(confetti);
+
+    const duration = 2000 + Math.random() * 1000;
+    const startTime = Date.now();
+    const xMovement = (Math.random() - 0.5) * 200;
+
+    function animateConfetti() {
+      const elapsed = Date.now() - startTime;
+      const progress = elapsed / duration;
+
+      if (progress < 1) {
+        confetti.style.top = (progress * window.innerHeight) + 'px';
+        confetti.style.transform = `translateX(${xMovement * progress}px) rotate(${progress * 720}deg)`;
+        confetti.style.opacity = (1 - progress).toString();
+        requestAnimationFrame(animateConfetti);
+      } else {
+        confetti.remove();
+      }
+    }
+
+    animateConfetti();
+  }
+}
+
+// Shorten URL
+async function shorten() {
+  const t = translations[currentLang];
+  const input = document.getElementById('url');
+  const url = input.value.trim();
+  const resultDiv = document.getElementById('result');
+
+  if (!url) {
+    playSound('error');
+    resultDiv.innerHTML = `<div class="result" style="border-color:var(--danger);background:rgba(239,68,68,.1);">${t.pleaseEnterUrl}</div>`;
+    return;
+  }
+
+  playSound('click');
+  resultDiv.innerHTML = `<div class="result"><div class="spinner"></div> ${t.processing}</div>`;
+
+  try {
+    const res = await fetch('/api/shorten', {
+      method: 'POST',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({url})
+    });
+
+    if (!res.ok) throw new Error(await res.text());
+
+    const data = await res.json();
+
+    // Success sound and confetti!
+    playSound('success');
+    createConfetti();
+
+    let html = '<div class="result">';
+    html += '<div class="result-url">';
+    html += `<strong>${t.shortUrl}</strong>`;
+    html += `<a href="${data.short_url}" target="_blank">${data.short_url}</a>`;
+    html += `<button class="copy-btn" onclick="copyToClipboard('${data.short_url}')">${t.copy}</button>`;
+    html += '</div>';
+
+    if (data.qr_url) {
+      html += '<div class="qr-container">';
+      html += `<img class="qr" src="${data.qr_url}" alt="QR Code"/>`;
+      html += '</div>';
+    }
+
+    html += '</div>';
+    resultDiv.innerHTML = html;
+
+    input.value = '';
+    loadAll();
+  } catch (e) {
+    playSound('error');
+    resultDiv.innerHTML = `<div class="result" style="border-color:var(--danger);background:rgba(239,68,68,.1);">❌ ${t.error}: ${e.message}</div>`;
+  }
+}
+
+// Copy to clipboard
+async function copyToClipboard(text) {
+  const t = translations[currentLang];
+  try {
+    await navigator.clipboard.writeText(text);
+    playSound('copy');
+
+    // Visual feedback
+    const btn = event.target;
+    const originalText = btn.innerHTML;
+    btn.innerHTML = t.copied;
+    btn.style.background = 'linear-gradient(135deg, #10b981, #059669)';
+
+    setTimeout(() => {
+      btn.innerHTML = originalText;
+      btn.style.background = '';
+    }, 2000);
+  } catch (e) {
+    playSound('error');
+    alert(t.copyError);
+  }
+}
+
+// Load URLs page by page (the API returns X-Next-Cursor while more rows exist)
+let nextCursor = null;
+
+function renderItem(u, t, locale) {
+  return `
+      <div class="url-item" id="url-${u.id}">
+        <div class="url-info">
+          <div>
+            <span class="url-code">${u.code}</span>
+            <a class="url-link" href="${u.original_url}" target="_blank">${u.original_url}</a>
+          </div>
+          <div class="url-meta">
+            <span class="stats-badge">👆 ${u.clicks} ${t.clicks}</span>
+            <span>📅 ${new Date(u.created_at).toLocaleDateString(locale)}</span>
+          </div>
+        </div>
+        <div class="url-actions">
+          <button class="copy-btn" onclick="copyToClipboard('${window.location.origin}/${u.code}')">📋</button>
+          <button class="btn-danger" onclick="deleteURL(${u.id})">${t.delete}</button>
+        </div>
+      </div>
+    `;
+}
+
+function renderMoreButton(t) {
+  const old = document.getElementById('load-more');
+  if (old) old.remove();
+  if (nextCursor === null) return;
+  document.getElementById('list').insertAdjacentHTML('beforeend', `
+      <div id="load-more" style="text-align:center;padding:10px;">
+        <button class="btn-secondary" onclick="loadMore()">${t.loadMore}</button>
+      </div>
+    `);
+}
+
+async function fetchPage(after) {
+  const res = await fetch(after === null ? '/api/urls' : `/api/urls?after=${after}`);
+  if (!res.ok) throw new Error(res.statusText);
+  nextCursor = res.headers.get('X-Next-Cursor');
+  return res.json();
+}
+
+function currentLocale() {
+  return currentLang === 'de' ? 'de-DE' : currentLang === 'tr' ? 'tr-TR' : 'en-US';
+}
+
+async function loadAll() {
+  const t = translations[currentLang];
+  const listDiv = document.getElementById('list');
+  listDiv.innerHTML = '<div style="text-align:center;padding:20px;"><div class="spinner"></div></div>';
+
+  try {
+    const data = await fetchPage(null);
+
+    if (!data.length) {
+      listDiv.innerHTML = `
+        <div class="empty-state">
+          <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+            <circle cx="12" cy="12" r="10"/>
+            <line x1="12" y1="8" x2="12" y2="12"/>
+            <line x1="12" y1="16" x2="12.01" y2="16"/>
+          </svg>
+          <p>${t.noUrls}<br/>${t.startMessage}</p>
+        </div>
+      `;
+      return;
+    }
+
+    const locale = currentLocale();
+    listDiv.innerHTML = data.map(u => renderItem(u, t, locale)).join('');
+    renderMoreButton(t);
+  } catch (e) {
+    listDiv.innerHTML = `<div class="empty-state">❌ ${t.error}</div>`;
+  }
+}
+
+// Append the next page below the rows already shown
+async function loadMore() {
+  const t = translations[currentLang];
+  if (nextCursor === null) return;
+  const button = document.querySelector('#load-more button');
+  if (button) button.innerHTML = '<div class="spinner"></div>';
+
+  try {
+    const data = await fetchPage(nextCursor);
+    const locale = currentLocale();
+    const more = document.getElementById('load-more');
+    if (more) more.remove();
+    document.getElementById('list').insertAdjacentHTML('beforeend', data.map(u => renderItem(u, t, locale)).join(''));
+    renderMoreButton(t);
+  } catch (e) {
+    playSound('error');
+    if (button) button.innerHTML = `❌ ${t.error}`;
+  }
+}
+
+// Delete URL
+async function deleteURL(id) {
+  const t = translations[currentLang];
+  if (!confirm(t.deleteConfirm)) return;
+
+  playSound('click');
+
+  try {
+    await fetch(`/api/urls/${id}`, {method: 'DELETE'});
+    playSound('delete');
+    // Remove the row in place so pages loaded with "load more" stay visible
+    const item = document.getElementById(`url-${id}`);
+    if (item) item.remove();
+    if (!document.querySelector('#list .url-item')) loadAll();
+  } catch (e) {
+    playSound('error');
+    alert(t.deleteError + ': ' + e.message);
+  }
+}
+
+// Initial load
+loadAll();
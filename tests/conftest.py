@@ -0,0 +1,12 @@
+"""Test oturumu ayarları: url_shortener içe aktarılmadan önce yüklenir.
+
+Uygulama modülü ayarları içe aktarılırken okuduğundan, testlerin tamamı
+bellek içi depolama motoruyla çalışır; SQLite'a ihtiyaç duyan testler
+kendi geçici dosyalarında motor örneği oluşturur.
+"""
+import os
+import sys
+from pathlib import Path
+
+os.environ["STORAGE_BACKEND"] = "memory"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
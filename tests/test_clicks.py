@@ -0,0 +1,59 @@
+"""Tıklama olay günlüğünün yazma hatalarında olayları koruması."""
+import pytest
+
+import url_shortener
+from url_shortener import ClickEventLog, MemoryStorage
+
+
+class FlakyStorage(MemoryStorage):
+    """record_clicks'in ilk çağrısı kilitli veritabanı gibi hata verir"""
+
+    failures = 1
+
+    def record_clicks(self, rows, rollups):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        return super().record_clicks(rows, rollups)
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    storage = FlakyStorage()
+    storage.init()
+    monkeypatch.setattr(url_shortener, "storage", storage)
+    yield storage
+    storage.close()
+
+
+def test_failed_write_is_requeued(flaky):
+    url_id = flaky.get_or_create("https://example.com/clicked")
+    log = ClickEventLog(1.0, capacity=10)
+    for _ in range(3):
+        log.record(url_id, "https://example.org/page", "Mozilla/5.0")
+    with pytest.raises(RuntimeError):
+        log.flush()
+    assert (log.written, log.dropped) == (0, 0)
+    assert log.flush() == 3
+    assert log.written == 3
+    assert sum(n for _, n in flaky.click_series(url_id, "minute", 0, 2**40)) == 3
+
+
+def test_requeue_beyond_capacity_counts_drops(flaky, monkeypatch):
+    url_id = flaky.get_or_create("https://example.com/clicked")
+    log = ClickEventLog(1.0, capacity=4)
+    for _ in range(4):
+        log.record(url_id, None, None)
+    original = url_shortener.db.write_blocking
+
+    def write_blocking(fn, *args, shard=0):
+        # Yazma sürerken gelen yeni olaylar tamponda yer kaplar
+        for _ in range(3):
+            log.record(url_id, None, None)
+        return original(fn, *args, shard=shard)
+
+    monkeypatch.setattr(url_shortener.db, "write_blocking", write_blocking)
+    with pytest.raises(RuntimeError):
+        log.flush()
+    assert log.dropped == 3
+    assert log.flush() == 4
@@ -0,0 +1,33 @@
+"""Süreli linklerin sınırları: aralık dışı ömürler satır eklenmeden reddedilir."""
+import pytest
+from fastapi.testclient import TestClient
+
+import url_shortener
+from url_shortener import MemoryStorage, app
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = MemoryStorage()
+    monkeypatch.setattr(url_shortener, "storage", storage)
+    return storage
+
+
+@pytest.mark.parametrize("extra", [
+    {"ttl": 10**12},
+    {"expires_at": "9999-12-31T23:59:59-12:00"},
+])
+def test_out_of_range_expiry_is_rejected(storage, extra):
+    client = TestClient(app)
+    response = client.post("/api/shorten", json={"url": "https://example.com/far", **extra})
+    assert response.status_code == 400
+    assert storage.stats()["urls"] == 0
+    assert client.get("/api/urls").status_code == 200
+
+
+def test_expiry_within_range_is_listed(storage):
+    client = TestClient(app)
+    response = client.post("/api/shorten", json={"url": "https://example.com/soon", "ttl": 3600})
+    assert response.status_code == 200
+    [row] = client.get("/api/urls").json()
+    assert row["expires_at"] is not None
@@ -0,0 +1,60 @@
+"""Kapanmadan ölen worker'ların id kiralarının temizlenmesi."""
+import time
+
+from url_shortener import SQLiteStorage
+
+
+def leases(storage) -> set:
+    with storage.connection() as conn:
+        return {row[0] for row in conn.execute("SELECT owner FROM id_leases")}
+
+
+def test_stale_leases_are_dropped_on_refresh(tmp_path):
+    path = tmp_path / "leases.db"
+    crashed, live = SQLiteStorage(path), SQLiteStorage(path)
+    crashed.init()
+    live.init()
+    try:
+        lost = crashed.get_or_create("https://example.com/crashed")
+        # close() çağrılmadan ölen worker: kirası tabloda kalır
+        crashed.pool.close()
+        live.get_or_create("https://example.com/live")
+        live.refresh_filter()
+        assert leases(live) == {crashed.ids.owner, live.ids.owner}
+        assert live.filter.stats()["unknown_ranges"] == 1
+
+        live.ids._beat = 0.0
+        with live.connection() as conn:
+            assert live.ids.heartbeat(conn, time.time() + live.ids.lease_ttl + 1) == 1
+        assert leases(live) == {live.ids.owner}
+        live.refresh_filter()
+        assert live.filter.stats()["unknown_ranges"] == 0
+        # Silinen kiradaki satırlar bit haritasına girmiştir
+        assert live.might_exist(lost)
+        assert not live.might_exist(lost + 1)
+    finally:
+        live.close()
+
+
+def test_owner_of_dropped_lease_takes_a_new_block(tmp_path):
+    path = tmp_path / "leases.db"
+    paused, other = SQLiteStorage(path), SQLiteStorage(path)
+    paused.init()
+    other.init()
+    try:
+        first = paused.get_or_create("https://example.com/a")
+        other.get_or_create("https://example.com/b")
+        with other.connection() as conn:
+            other.ids.heartbeat(conn, time.time() + other.ids.lease_ttl + 1)
+        assert paused.ids.owner not in leases(other)
+
+        # Duraklayan süreç uyandığında son heartbeat'i çok eskidedir
+        paused.ids._beat = 0.0
+        with paused.connection() as conn:
+            paused.ids.heartbeat(conn, time.time())
+        second = paused.get_or_create("https://example.com/c")
+        assert second >= first + paused.ids.block_size
+        assert paused.ids.owner in leases(paused)
+    finally:
+        paused.close()
+        other.close()
@@ -0,0 +1,48 @@
+"""Hız sınırlayıcının route eşlemesi ve istemci anahtarı."""
+import pytest
+
+from url_shortener import RateLimitMiddleware, encode_id
+
+
+async def empty_app(scope, receive, send):
+    pass
+
+
+@pytest.fixture
+def limiter():
+    return RateLimitMiddleware(empty_app, rules={"redirect_url": (1.0, 1)})
+
+
+@pytest.mark.parametrize("method, path, name", [
+    ("GET", "/" + encode_id(123456), "redirect_url"),
+    ("GET", "/yaz-indirimi", "redirect_url"),
+    ("GET", "/favicon.ico", "redirect_url"),
+    ("POST", "/abc", None),
+    ("GET", "/urls", "list_urls"),
+    ("GET", "/api/urls", "list_urls"),
+    ("POST", "/shorten", "shorten"),
+    ("GET", "/docs", "swagger_ui_html"),
+    ("GET", "/openapi.json", "openapi"),
+    ("GET", "/", "home"),
+    ("GET", "/abc/qr.png", "qr_image"),
+])
+def test_resolve_matches_routing(limiter, method, path, name):
+    assert limiter._resolve(method, path) == name
+
+
+def scope(headers=()):
+    return {"type": "http", "headers": list(headers), "client": ("10.0.0.1", 1)}
+
+
+def test_header_key_requires_configured_keys(limiter):
+    limiter.key_header = b"x-api-key"
+    limiter.api_keys = frozenset({"k1"})
+    assert limiter._client(scope([(b"x-api-key", b"k1")])) == "h:k1"
+    # Bilinmeyen değerler döndürülerek sınır aşılamaz; IP'ye düşülür
+    assert limiter._client(scope([(b"x-api-key", b"rotated")])) == "10.0.0.1"
+    assert limiter._client(scope()) == "10.0.0.1"
+
+
+def test_header_key_trusted_without_key_set(limiter):
+    limiter.key_header = b"x-real-ip"
+    assert limiter._client(scope([(b"x-real-ip", b"203.0.113.7")])) == "h:203.0.113.7"
@@ -0,0 +1,104 @@
+"""/{code} catch-all'ının API, doküman ve QR yollarını yutmadığını doğrular."""
+import pytest
+from fastapi.testclient import TestClient
+
+import url_shortener
+from url_shortener import MemoryStorage, app, encode_id
+
+
+class StubStorage:
+    """Her öznitelik erişimini kaydeden, hiçbir şey döndürmeyen depolama"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        self.calls.append(name)
+        raise AssertionError(f"beklenmeyen depolama çağrısı: {name}")
+
+
+class RoutedApp:
+    """İsteği uygulamaya iletir ve Starlette'in seçtiği handler'ı kaydeder"""
+
+    def __init__(self):
+        self.endpoints = []
+
+    async def __call__(self, scope, receive, send):
+        await app(scope, receive, send)
+        if scope["type"] == "http":
+            self.endpoints.append(scope.get("endpoint"))
+
+
+@pytest.fixture
+def routed():
+    return RoutedApp()
+
+
+@pytest.fixture
+def client(routed):
+    return TestClient(routed)
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    storage = MemoryStorage()
+    monkeypatch.setattr(url_shortener, "storage", storage)
+    url_shortener.redirect_cache.clear()
+    url_shortener.alias_cache.clear()
+    return storage
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    storage = StubStorage()
+    monkeypatch.setattr(url_shortener, "storage", storage)
+    url_shortener.redirect_cache.clear()
+    url_shortener.alias_cache.clear()
+    return storage
+
+
+@pytest.mark.parametrize("path", ["/urls", "/api/urls"])
+def test_urls_reach_list_urls(client, routed, memory, path):
+    memory.get_or_create("https://example.com/a")
+    response = client.get(path)
+    assert routed.endpoints == [url_shortener.list_urls]
+    assert response.status_code == 200
+    assert [row["original_url"] for row in response.json()] == ["https://example.com/a"]
+
+
+@pytest.mark.parametrize("after", ["-1", str(2**63), "99999999999999999999999"])
+def test_out_of_range_cursor_is_rejected(client, stub, after):
+    response = client.get("/api/urls", params={"after": after})
+    assert response.status_code == 422
+    assert stub.calls == []
+
+
+@pytest.mark.parametrize("path", ["/docs", "/openapi.json"])
+def test_docs_not_taken_by_catch_all(client, routed, stub, path):
+    response = client.get(path)
+    assert routed.endpoints[0] is not url_shortener.redirect_url
+    assert response.status_code == 200
+    assert stub.calls == []
+
+
+@pytest.mark.parametrize("path", [
+    "/favicon.ico", "/robots.txt", "/admin", "/api", "/static", "/shorten",
+    "/ab.cd", "/a!b", "/%C3%A7ok", "/x~y", "/" + "a" * 65,
+])
+def test_reserved_and_invalid_codes_skip_storage(client, routed, stub, path):
+    response = client.get(path, follow_redirects=False)
+    assert routed.endpoints == [url_shortener.redirect_url]
+    assert response.status_code == 404
+    assert stub.calls == []
+
+
+def test_qr_route_still_resolves(client, routed, memory):
+    url_id = memory.get_or_create("https://example.com/qr")
+    code = encode_id(url_id)
+    response = client.get(f"/{code}/qr.png")
+    assert routed.endpoints == [url_shortener.qr_image]
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    redirect = client.get(f"/{code}", follow_redirects=False)
+    assert redirect.status_code == 307
+    assert redirect.headers["location"] == "https://example.com/qr"
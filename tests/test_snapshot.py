@@ -0,0 +1,23 @@
+"""Canlı (WAL kipindeki) veritabanını okuyan snapshot kopyasının yeniden yüklenmesi."""
+from url_shortener import SnapshotStorage, SQLiteStorage
+
+
+def test_reload_sees_links_still_in_wal(tmp_path):
+    path = tmp_path / "live.db"
+    primary = SQLiteStorage(path)
+    primary.init("balanced")
+    try:
+        first = primary.get_or_create("https://example.com/first")
+        replica = SnapshotStorage(path)
+        replica.init()
+        assert replica.get_by_id(first) == ("https://example.com/first", None)
+        assert replica.reload() is False
+
+        # Checkpoint olmadan yalnızca -wal dosyası değişir
+        second = primary.get_or_create("https://example.com/second")
+        assert path.with_name(path.name + "-wal").exists()
+        assert replica.get_by_id(second) is None
+        assert replica.reload() is True
+        assert replica.get_by_id(second) == ("https://example.com/second", None)
+    finally:
+        primary.close()
@@ -0,0 +1,14 @@
+"""Depolama motorlarının ortak davranış senaryosu (benchmarks/bench_storage.py'deki check)."""
+import pytest
+
+from benchmarks.bench_storage import ENGINES, check
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_engine_conforms(engine, tmp_path):
+    storage = ENGINES[engine](tmp_path)
+    storage.init()
+    try:
+        check(storage)
+    finally:
+        storage.close()
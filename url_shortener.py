@@ -1,81 +1,2509 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, HttpUrl
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Route, compile_path
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter, ValidationError
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 import sqlite3
-from datetime import datetime
+import sys
+import threading
+import logging
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit, urlunsplit
+from typing import Optional, Protocol
 from pathlib import Path
 import io
 import base64
+import hashlib
+import gzip
+import json
+import re
+import bisect
+import heapq
+from array import array
+from itertools import repeat
+import hmac
+import math
+import random
 
-DB_PATH = Path(__file__).with_name("url_shortener.db")
+STATIC_DIR = Path(__file__).with_name("static")
+# "sqlite" (varsayılan), "memory" (kalıcı değil; benchmark/test için) ya da
+# "snapshot" (salt okunur, yalnızca yönlendirme yapan kopyalar için)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite")
+DB_PATH = Path(os.getenv("DATABASE_URL", Path(__file__).with_name("url_shortener.db")))
+# snapshot motorunun okuduğu veritabanı kopyası ve değişiklik kontrolü aralığı (saniye)
+SNAPSHOT_PATH = Path(os.getenv("SNAPSHOT_PATH", DB_PATH))
+SNAPSHOT_RELOAD = float(os.getenv("SNAPSHOT_RELOAD", "5.0"))
+# Her worker'ın id_blocks sayacından tek seferde ayırdığı id sayısı
+ID_BLOCK_SIZE = int(os.getenv("ID_BLOCK_SIZE", "1000"))
+# Bu kadar saniye tazelenmeyen id kirası (çökmüş/öldürülmüş worker) negatif filtre eşitlemesinde silinir
+ID_LEASE_TTL = float(os.getenv("ID_LEASE_TTL", "60"))
+# Var olmayan kodları DB'ye gitmeden eleyen id bit haritası; sınır aşılırsa kendini kapatır
+NEGATIVE_FILTER = os.getenv("NEGATIVE_FILTER", "1") not in ("0", "false", "off")
+NEGATIVE_FILTER_REFRESH = float(os.getenv("NEGATIVE_FILTER_REFRESH", "1.0"))
+NEGATIVE_FILTER_MAX_IDS = int(os.getenv("NEGATIVE_FILTER_MAX_IDS", str(2**30)))
+NEGATIVE_FILTER_HEADROOM = int(os.getenv("NEGATIVE_FILTER_HEADROOM", str(2**20)))
+# >1 ise veriler <ad>.0.db ... <ad>.N-1.db dosyalarına bölünür; veri yazıldıktan sonra değiştirmeyin
+DB_SHARDS = max(1, int(os.getenv("DB_SHARDS", "1")))
+# Starlette'ın varsayılan threadpool'u 40 thread; havuz ona göre boyutlanır
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "40"))
+DB_PRAGMAS = [p.strip() for p in os.getenv("DB_PRAGMAS", "").split(";") if p.strip()]
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "balanced")
+# "dedicated": tek yazıcı + N okuyucu thread, "threadpool": Starlette'ın ortak havuzu
+DB_EXECUTOR = os.getenv("DB_EXECUTOR", "dedicated")
+DB_READERS = int(os.getenv("DB_READERS", "8"))
 ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+REDIRECT_CACHE_SIZE = int(os.getenv("REDIRECT_CACHE_SIZE", "10000"))
+# Toplu kısaltmada transaction başına URL sayısı (SQLite'ın 999 parametre sınırının altında)
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+# /urls sayfalama: varsayılan/en büyük sayfa ve NDJSON akışında sorgu başına satır
+LIST_PAGE_SIZE = 100
+LIST_PAGE_MAX = 1000
+LIST_STREAM_BATCH = 1000
+QR_CACHE_SIZE = int(os.getenv("QR_CACHE_SIZE", "1000"))
+CLICK_FLUSH_INTERVAL = float(os.getenv("CLICK_FLUSH_INTERVAL", "1.0"))
+CLICK_FLUSH_THRESHOLD = int(os.getenv("CLICK_FLUSH_THRESHOLD", "1000"))
+# Yazılmayı bekleyen tıklama olayları için halka tampon kapasitesi
+CLICK_EVENT_BUFFER = int(os.getenv("CLICK_EVENT_BUFFER", "100000"))
+# Süresi dolmuş linklerin silinme aralığı (saniye) ve tek işlemde silinen satır sayısı
+REAPER_INTERVAL = float(os.getenv("REAPER_INTERVAL", "5.0"))
+REAPER_BATCH = int(os.getenv("REAPER_BATCH", "500"))
+# Link ömrünün üst sınırı (saniye); ötesi datetime aralığını aşıp listelemeyi bozar
+MAX_TTL = 100 * 365 * 86400
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
 
 app = FastAPI(title="URL Shortener Pro")
+# JSON API; hem /api altında hem de eski yollarla (/shorten, /urls) sunulur
+api = APIRouter()
+logger = logging.getLogger("uvicorn.error")
+
+# ============ Metrikler ============
+# Gecikme histogramları için üst sınırlar (saniye)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class _PerThreadMetric:
+    """Her thread kendi sözlüğüne kilitsiz yazar; /metrics okurken shard'ları toplar"""
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        metrics.append(self)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            # Kilit thread başına yalnızca bir kez, ilk yazmada alınır
+            values = self._local.values = {}
+            with self._shards_lock:
+                self._shards.append(values)
+            return values
+
+    def _merged(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+        # list(dict.items()) GIL altında tek adımda kopyalanır
+        return [item for shard in shards for item in list(shard.items())]
+
+    def _label_text(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{k}="{v}"' for k, v in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class MetricCounter(_PerThreadMetric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        values = self._shard()
+        values[labels] = values.get(labels, 0) + amount
+
+    def totals(self) -> dict:
+        totals = {}
+        for labels, value in self._merged():
+            totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def collect(self) -> list:
+        return self.header() + [
+            f"{self.name}{self._label_text(labels)} {value}" for labels, value in sorted(self.totals().items())
+        ]
+
+class MetricGauge(MetricCounter):
+    """Artı/eksi yönde değişen sayaç (ör. işlenmekte olan istekler)"""
+    kind = "gauge"
+
+    def dec(self, *labels):
+        self.inc(*labels, amount=-1)
+
+    def set(self, value: float, *labels):
+        # Yalnızca tek bir thread'in yazdığı gauge'lar için: toplam, o thread'in değeridir
+        self._shard()[labels] = value
+
+class MetricHistogram(_PerThreadMetric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, seconds: float, *labels):
+        values = self._shard()
+        row = values.get(labels)
+        if row is None:
+            # [kova sayıları..., +Inf, toplam, adet]
+            row = values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        row[bisect.bisect_left(self.buckets, seconds)] += 1
+        row[-2] += seconds
+        row[-1] += 1
+
+    def collect(self) -> list:
+        merged = {}
+        for labels, row in self._merged():
+            total = merged.setdefault(labels, [0] * len(row))
+            for i, value in enumerate(row):
+                total[i] += value
+        lines = self.header()
+        for labels, row in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), row):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{self._label_text(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(labels)} {row[-2]}")
+            lines.append(f"{self.name}_count{self._label_text(labels)} {row[-1]}")
+        return lines
+
+metrics = []
+# Kazıma anında değer üreten ek kaynaklar (önbellek istatistikleri vb.)
+metric_collectors = []
+
+http_requests = MetricCounter("http_requests_total", "İşlenen HTTP istekleri", ("route", "status"))
+http_latency = MetricHistogram("http_request_duration_seconds", "Route başına istek süresi", ("route",))
+http_in_flight = MetricGauge("http_requests_in_flight", "İşlenmekte olan HTTP istekleri")
+db_latency = MetricHistogram("db_query_duration_seconds", "Depolama çağrısı süresi (thread içinde)", ("op",))
+pool_wait = MetricHistogram("db_pool_acquire_seconds", "Havuzdan bağlantı alma süresi")
+negative_lookups = MetricCounter(
+    "negative_filter_total", "Negatif filtre sonuçları: DB'siz reddedilen ve filtreden geçip DB'de bulunamayan",
+    ("result",)
+)
+qr_render = MetricHistogram("qr_render_seconds", "QR görseli üretim süresi", ("format",))
+links_reaped = MetricCounter("links_reaped_total", "Süresi dolduğu için silinen linkler")
+expired_backlog = MetricGauge("links_expired_backlog", "Süresi dolmuş, henüz silinmemiş linkler")
+reap_batch_latency = MetricHistogram("reaper_batch_duration_seconds", "Reaper partisi başına silme işlemi süresi")
+
+def render_metrics() -> str:
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.collect())
+    for collector in metric_collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+class MetricsMiddleware:
+    """Saf ASGI middleware: route başına süre, durum kodu ve eşzamanlı istek sayısı"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Router eşleşen endpoint'i aynı scope sözlüğüne yazar
+            endpoint = scope.get("endpoint")
+            route = getattr(endpoint, "__name__", "unmatched")
+            http_latency.observe(time.perf_counter() - start, route)
+            http_requests.inc(route, status)
+            http_in_flight.dec()
+
+app.add_middleware(MetricsMiddleware)
+
+# ============ Profilleme ============
+# Profillenecek isteklerin oranı (0 = kapalı) ve örnekleyicinin yığın alma aralığı
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_BUFFER = int(os.getenv("PROFILE_BUFFER", "200"))
+PROFILE_HEADER = "x-debug-profile"
+PROFILE_MAX_DEPTH = 64
+# Yönetim uçları ve hata ayıklama başlığı için paylaşılan sır; tanımlı değilse ikisi de kapalıdır
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Beklemede olan thread'lerin en içteki çerçeveleri; örneklere gürültü katmasınlar diye atlanır
+_IDLE_FRAMES = frozenset({
+    ("threading.py", "wait"), ("thread.py", "_worker"), ("selectors.py", "select"),
+    ("queue.py", "get"), ("threading.py", "_wait_for_tstate_lock"),
+})
+
+class RequestProfile:
+    __slots__ = ("method", "path", "route", "status", "started", "clock", "total_ms", "phases", "samples")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = None
+        self.status = None
+        self.started = time.time()
+        self.clock = time.perf_counter()
+        self.total_ms = 0.0
+        self.phases = {}
+        self.samples = Counter()
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds * 1000
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in self.phases.items())
+
+    def to_dict(self) -> dict:
+        phases = {name: round(ms, 3) for name, ms in self.phases.items()}
+        phases["other"] = round(max(0.0, self.total_ms - sum(self.phases.values())), 3)
+        return {
+            "ts": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "method": self.method, "path": self.path, "route": self.route, "status": self.status,
+            "total_ms": round(self.total_ms, 3), "phases": phases, "samples": sum(self.samples.values()),
+        }
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+@contextmanager
+def profile_phase(name: str):
+    """Profillenen bir istekte bloğun süresini verilen faza ekler"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - start)
+
+def profile_handler_entry():
+    """Profillenen istekte handler'a girene kadarki süreyi (yönlendirme, gövde okuma,
+    Pydantic doğrulaması) 'validate' fazına yazar; böylece 'other' yanıt serileştirmesine kalır"""
+    profile = _current_profile.get()
+    if profile is not None and "validate" not in profile.phases:
+        profile.add("validate", time.perf_counter() - profile.clock)
+
+class StackSampler:
+    """Profillenen istek varken tüm thread'lerin yığınlarını aralıklarla örnekler.
+
+    Örnekler o anda açık olan tüm profillere yazılır; eşzamanlı istekler aynı
+    thread'leri paylaştığından yüksek yükte yığınlar birbirine karışabilir.
+    """
+
+    def __init__(self, interval: float, capacity: int):
+        self.interval = interval
+        self.entries = deque(maxlen=capacity)
+        self._active = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def begin(self, profile: RequestProfile):
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def end(self, profile: RequestProfile):
+        with self._lock:
+            self._active.discard(profile)
+            if not self._active:
+                self._wake.clear()
+        self.entries.append(profile)
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                active = list(self._active)
+            if not active:
+                continue
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append((os.path.basename(code.co_filename), code.co_name))
+                    frame = frame.f_back
+                if not stack or stack[0] in _IDLE_FRAMES:
+                    continue
+                collapsed = ";".join(
+                    [names.get(ident, str(ident))] + [f"{name} ({filename})" for filename, name in reversed(stack)]
+                )
+                for profile in active:
+                    profile.samples[collapsed] += 1
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """Tampondaki örnekleri flamegraph.pl / speedscope'un okuduğu 'yığın sayı' biçiminde verir"""
+        merged = Counter()
+        for profile in list(self.entries):
+            if route is None or profile.route == route:
+                merged.update(profile.samples)
+        return "".join(f"{stack} {count}\n" for stack, count in merged.most_common())
+
+profiler = StackSampler(PROFILE_INTERVAL, PROFILE_BUFFER)
+
+class ProfilingMiddleware:
+    """Saf ASGI middleware: isteklerin bir örneğini ya da hata ayıklama başlığı taşıyanları profiller"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _wanted(self, scope) -> bool:
+        if ADMIN_TOKEN:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER.encode() and hmac.compare_digest(value, ADMIN_TOKEN.encode()):
+                    return True
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            return await self.app(scope, receive, send)
+        profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                timing = profile.server_timing()
+                if timing:
+                    message["headers"] = [*message.get("headers", ()), (b"server-timing", timing.encode())]
+            await send(message)
+
+        token = _current_profile.set(profile)
+        profiler.begin(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.total_ms = (time.perf_counter() - profile.clock) * 1000
+            profile.route = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            _current_profile.reset(token)
+            profiler.end(profile)
+
+app.add_middleware(ProfilingMiddleware)
+
+# ============ Hız Sınırlama ============
+# "route=hız[:patlama]" listesi; hız saniyedeki istek, patlama kova boyutu (ör. "shorten=5:20")
+RATE_LIMITS = os.getenv("RATE_LIMITS", "")
+# "memory": worker başına, "sqlite": RATE_LIMIT_DB dosyası üzerinden tüm worker'larda ortak
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", str(DB_PATH.with_name(DB_PATH.stem + ".ratelimit.db")))
+# "ip" ya da istemciyi tanımlayan bir başlık (ör. "x-api-key", proxy arkasında "x-real-ip");
+# başlık yoksa istemci IP'sine düşülür
+RATE_LIMIT_KEY = os.getenv("RATE_LIMIT_KEY", "ip")
+# Verilirse başlık değeri yalnızca bu listedeyse (virgülle ayrılmış) anahtar olur, diğerleri IP'ye düşer;
+# boşsa başlığa koşulsuz güvenilir, bu yalnızca başlığı kendisi yazan bir proxy arkasında güvenlidir
+RATE_LIMIT_API_KEYS = frozenset(filter(None, (k.strip() for k in os.getenv("RATE_LIMIT_API_KEYS", "").split(","))))
+# Dolmuş (boşta) kovaların silinme aralığı (saniye) ve route eşleme önbelleği sınırı
+RATE_LIMIT_SWEEP = 10.0
+ROUTE_CACHE_MAX = 65536
+# API router'ının bağlandığı önekler; kök, eski istemciler için şemaya girmeden korunur
+API_PREFIXES = ("/api", "")
+
+def parse_rate_limits(spec: str) -> dict:
+    """'shorten=5:20,redirect_url=100' -> {'shorten': (5.0, 20), 'redirect_url': (100.0, 100)}"""
+    rules = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, value = item.partition("=")
+        rate, _, burst = value.partition(":")
+        rate = float(rate)
+        if rate <= 0:
+            raise ValueError(f"Geçersiz hız sınırı: {item}")
+        rules[route.strip()] = (rate, int(burst) if burst else max(1, int(rate)))
+    return rules
+
+class TokenBuckets:
+    """GCRA biçiminde token bucket: anahtar başına tek bir float (kovanın dolacağı an)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1.0 / rate
+        self.limit = burst * self.interval
+        self.tats = {}
+        self._next_sweep = 0.0
+
+    def hit(self, key: str, now: float) -> float:
+        """İzin verilirse 0, verilmezse tekrar denemeden önce beklenecek saniye"""
+        tat = self.tats.get(key, now)
+        if tat < now:
+            tat = now
+        tat += self.interval
+        if tat - now > self.limit:
+            return tat - now - self.limit
+        self.tats[key] = tat
+        if now >= self._next_sweep:
+            self.sweep(now)
+        return 0.0
+
+    def sweep(self, now: float):
+        # Dolmuş bir kova ile hiç olmayan kova aynı davranır; boşta kalanlar atılır
+        self.tats = {key: tat for key, tat in self.tats.items() if tat > now}
+        self._next_sweep = now + RATE_LIMIT_SWEEP
+
+class SharedTokenBuckets:
+    """Aynı algoritma, durum SQLite tablosunda: tüm uvicorn worker'ları aynı kovaları görür"""
+
+    def __init__(self, path: str, route: str, rate: float, burst: int):
+        self.route = route
+        self.interval = 1.0 / rate
+        self.limit = burst * self.interval
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA busy_timeout = 1000")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                route TEXT NOT NULL,
+                key TEXT NOT NULL,
+                tat REAL NOT NULL,
+                PRIMARY KEY (route, key)
+            ) WITHOUT ROWID
+        """)
+        self._next_sweep = 0.0
+
+    def hit(self, key: str, now: float) -> float:
+        # Tek ifadelik koşullu upsert: okuma-değiştirme-yazma worker'lar arasında atomiktir
+        row = self.conn.execute(
+            "INSERT INTO rate_limits (route, key, tat) VALUES (?1, ?2, ?3 + ?4) "
+            "ON CONFLICT (route, key) DO UPDATE SET tat = MAX(tat, ?3) + ?4 "
+            "WHERE MAX(tat, ?3) + ?4 - ?3 <= ?5 RETURNING tat",
+            (self.route, key, now, self.interval, self.limit)
+        ).fetchone()
+        if now >= self._next_sweep:
+            self._next_sweep = now + RATE_LIMIT_SWEEP
+            self.conn.execute("DELETE FROM rate_limits WHERE route = ? AND tat <= ?", (self.route, now))
+        if row is not None:
+            return 0.0
+        tat = self.conn.execute(
+            "SELECT tat FROM rate_limits WHERE route = ? AND key = ?", (self.route, key)
+        ).fetchone()
+        return max(0.0, tat[0] + self.interval - now - self.limit) if tat else self.interval
+
+    @property
+    def tats(self) -> dict:
+        return dict(self.conn.execute("SELECT key, tat FROM rate_limits WHERE route = ?", (self.route,)))
+
+rate_limited = MetricCounter("rate_limited_total", "Hız sınırına takılan istekler", ("route",))
+
+class RateLimitMiddleware:
+    """Saf ASGI middleware: route başına, istemci IP'si ya da RATE_LIMIT_KEY başlığıyla anahtarlanan token bucket.
+
+    Yönlendirme/metrik katmanlarından önce çalışır; reddedilen istekler
+    uygulamaya hiç girmez. Route adı (endpoint fonksiyonu) method ve path
+    başına önbelleklenir. Sabit bir route'a ait olmayan tek parçalı yollar
+    (çoğu benzersiz olan /{code} trafiği) tablo taranmadan ve önbelleğe
+    yazılmadan doğrudan catch-all route'a eşlenir.
+    """
+
+    def __init__(self, app, rules: dict, backend: str = "memory"):
+        self.app = app
+        if backend == "sqlite":
+            self.buckets = {
+                route: SharedTokenBuckets(RATE_LIMIT_DB, route, rate, burst) for route, (rate, burst) in rules.items()
+            }
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="rate-limit")
+        elif backend == "memory":
+            self.buckets = {route: TokenBuckets(rate, burst) for route, (rate, burst) in rules.items()}
+            self._executor = None
+        else:
+            raise ValueError(f"Bilinmeyen RATE_LIMIT_BACKEND: {backend}")
+        # method -> {path: route adı}
+        self._routes = {}
+        self._table = None
+        # Sabit tek parçalı yollar (/docs, /urls, ...) ve method -> tek parçalı catch-all route adı
+        self._literals = frozenset()
+        self._catch_all = {}
+        self.key_header = RATE_LIMIT_KEY.lower().encode() if RATE_LIMIT_KEY != "ip" else None
+        self.api_keys = RATE_LIMIT_API_KEYS
+
+    @staticmethod
+    def _route_table() -> list:
+        # API router'ı API_PREFIXES altında, /{code} gibi uygulama route'larından önce bağlanır
+        table = []
+        for prefix in API_PREFIXES:
+            for route in api.routes:
+                table.append((prefix + route.path, compile_path(prefix + route.path)[0], route.methods, route.name))
+        # /docs gibi APIRoute olmayan route'lar da /{code}'dan önce eşleşmelidir
+        for route in app.router.routes:
+            if isinstance(route, Route) and route.methods:
+                table.append((route.path, route.path_regex, route.methods, route.name))
+        return table
+
+    def _build(self):
+        table = self._route_table()
+        self._literals = frozenset(
+            path for path, *_ in table if "{" not in path and path.find("/", 1) < 0
+        ) | {"/" + name for name in RESERVED_PATHS}
+        for path, _, methods, name in table:
+            if re.fullmatch(r"/\{\w+\}", path):
+                for method in methods:
+                    self._catch_all.setdefault(method, name)
+        self._table = [(regex, methods, name) for _, regex, methods, name in table]
+
+    def _resolve(self, method: str, path: str) -> Optional[str]:
+        if self._table is None:
+            self._build()
+        if path.find("/", 1) < 0 and path not in self._literals:
+            return self._catch_all.get(method)
+        name = next((name for regex, methods, name in self._table if method in methods and regex.match(path)), None)
+        routes = self._routes.setdefault(method, {})
+        if len(routes) >= ROUTE_CACHE_MAX:
+            routes.clear()
+        routes[path] = name
+        return name
+
+    def _client(self, scope) -> str:
+        if self.key_header is not None:
+            for name, value in scope["headers"]:
+                if name == self.key_header:
+                    value = value.decode("latin-1")
+                    if not self.api_keys or value in self.api_keys:
+                        return "h:" + value
+                    break
+        client = scope.get("client")
+        return client[0] if client else ""
+
+    async def __call__(self, scope, receive, send):
+        # Sıcak yol bilerek satır içi: önbellekteki ya da tek parçalı /{code} yollarında yalnızca birkaç sözlük araması
+        if scope["type"] == "http":
+            method, path = scope["method"], scope["path"]
+            routes = self._routes.get(method)
+            name = routes.get(path, "") if routes is not None else ""
+            if name == "":
+                if self._table is not None and path.find("/", 1) < 0 and path not in self._literals:
+                    name = self._catch_all.get(method)
+                else:
+                    name = self._resolve(method, path)
+            buckets = self.buckets.get(name)
+            if buckets is not None:
+                key = self._client(scope)
+                now = time.time()
+                if self._executor is None:
+                    retry = buckets.hit(key, now)
+                else:
+                    retry = await asyncio.get_running_loop().run_in_executor(self._executor, buckets.hit, key, now)
+                if retry:
+                    rate_limited.inc(name)
+                    response = JSONResponse(
+                        {"detail": "Çok fazla istek"}, status_code=429,
+                        headers={"Retry-After": str(math.ceil(retry))}
+                    )
+                    return await response(scope, receive, send)
+        await self.app(scope, receive, send)
+
+if RATE_LIMITS:
+    app.add_middleware(RateLimitMiddleware, rules=parse_rate_limits(RATE_LIMITS), backend=RATE_LIMIT_BACKEND)
+
+# ============ Yardımcı Fonksiyonlar ============
+# Verilirse kodlar sıralı id'yi göstermez: id, anahtarlı bir permütasyondan geçirilir.
+# CODE_KEY_FROM'dan küçük id'ler (anahtar eklenmeden önceki linkler) eski kodlarını korur
+CODE_KEY = os.getenv("CODE_KEY", "")
+CODE_KEY_FROM = int(os.getenv("CODE_KEY_FROM", "0"))
+CODE_ID_BITS = 40
+# Ters arama tablosu ve iki haneli (62^2) kodlama tablosu
+_DECODE_TABLE = {c: i for i, c in enumerate(ALPHABET)}
+_PAIRS = [a + b for a in ALPHABET for b in ALPHABET]
+_PAIR_BASE = len(_PAIRS)
+# SQLite INTEGER 64 bit: 62^11 > 2^63 olduğundan daha uzun kod geçerli olamaz
+MAX_CODE_LEN = 11
+MAX_ID = 2**63 - 1
+# Kısa yolda sayısal kodlar en fazla 7 karakterdir (id < 62^7 ≈ 3.5 * 10^12). Daha uzun
+# ya da - / _ içeren kodlar takma addır; iki ad alanı hiçbir zaman çakışmaz
+NUMERIC_CODE_LEN = 7
+
+def base62(n: int) -> str:
+    if n < 62:
+        return ALPHABET[n]
+    s = []
+    # Her divmod'da iki hane üretilir
+    while n >= _PAIR_BASE:
+        n, r = divmod(n, _PAIR_BASE)
+        s.append(_PAIRS[r])
+    s.append(ALPHABET[n] if n < 62 else _PAIRS[n])
+    s.reverse()
+    return "".join(s)
+
+def base62_decode(code: str) -> int:
+    if len(code) > MAX_CODE_LEN:
+        raise ValueError("Kod çok uzun")
+    table = _DECODE_TABLE
+    n = 0
+    try:
+        for c in code:
+            n = n * 62 + table[c]
+    except KeyError:
+        raise ValueError(f"Geçersiz karakter: {c!r}") from None
+    if n > MAX_ID:
+        raise ValueError("Kod 64 bit sınırını aşıyor")
+    return n
+
+class FeistelPermutation:
+    """2^bits id uzayında anahtarlı, birebir permütasyon (dengeli Feistel ağı).
+
+    Tur fonksiyonu kriptografik değil, çarp-kaydır-xor karışımıdır; amaç
+    sıralı taramayı engellemektir. Tablo yoktur, iki yön de O(1)'dir.
+    """
+
+    def __init__(self, key: bytes, bits: int = CODE_ID_BITS, rounds: int = 4):
+        self.bits = bits
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        digest = hashlib.blake2b(key, digest_size=4 * rounds, person=b"short-code").digest()
+        self.keys = tuple(int.from_bytes(digest[i:i + 4], "big") for i in range(0, len(digest), 4))
+
+    def encrypt(self, n: int) -> int:
+        half, mask = self.half, self.mask
+        left, right = n >> half, n & mask
+        for k in self.keys:
+            x = ((right ^ k) * 0x45D9F3B) & 0xFFFFFFFF
+            x = ((x ^ (x >> 16)) * 0x45D9F3B) & 0xFFFFFFFF
+            left, right = right, left ^ (x ^ (x >> 16)) & mask
+        return (left << half) | right
+
+    def decrypt(self, n: int) -> int:
+        half, mask = self.half, self.mask
+        left, right = n >> half, n & mask
+        for k in reversed(self.keys):
+            x = ((left ^ k) * 0x45D9F3B) & 0xFFFFFFFF
+            x = ((x ^ (x >> 16)) * 0x45D9F3B) & 0xFFFFFFFF
+            left, right = right ^ (x ^ (x >> 16)) & mask, left
+        return (left << half) | right
+
+code_permutation = FeistelPermutation(CODE_KEY.encode()) if CODE_KEY else None
+# Permütasyonlu kodlar hep 7 karakterdir: 62^6 + P(id) < 62^6 + 2^40 < 62^7. Eski kodlar
+# bundan kısadır, böylece iki biçim uzunluktan ayrılır
+_PERMUTED_BASE = 62 ** (NUMERIC_CODE_LEN - 1)
+if CODE_KEY_FROM > _PERMUTED_BASE:
+    raise ValueError("CODE_KEY_FROM 62^6'dan büyük olamaz")
+
+def encode_id(url_id: int) -> str:
+    """id -> kısa kod; CODE_KEY varsa base62'den önce permütasyon uygulanır"""
+    if code_permutation is None or url_id < CODE_KEY_FROM:
+        return base62(url_id)
+    if url_id >> CODE_ID_BITS:
+        raise ValueError("id 40 bit kod alanını aşıyor")
+    return base62(_PERMUTED_BASE + code_permutation.encrypt(url_id))
+
+def encode_ids(ids) -> list:
+    """Toplu işlemler için encode_id"""
+    if code_permutation is None:
+        return [base62(n) for n in ids]
+    return [encode_id(n) for n in ids]
+
+def decode_id(code: str) -> Optional[int]:
+    """encode_id'nin tersi; bu kodlamayla üretilemeyecek kodlarda None"""
+    n = base62_decode(code)
+    if code_permutation is None:
+        return n
+    if len(code) < NUMERIC_CODE_LEN:
+        return n if n < CODE_KEY_FROM else None
+    n -= _PERMUTED_BASE
+    if n < 0 or n >> CODE_ID_BITS:
+        return None
+    url_id = code_permutation.decrypt(n)
+    return url_id if url_id >= CODE_KEY_FROM else None
+
+class LRUCache:
+    """Sınırlı boyutlu, thread-safe LRU önbellek (hit/miss/eviction sayaçlı)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+# Sık kullanılan kodlar için id -> (original_url, expires_at) önbelleği
+redirect_cache = LRUCache(REDIRECT_CACHE_SIZE)
+# takma ad -> id önbelleği; hedef URL yine redirect_cache'ten gelir
+alias_cache = LRUCache(REDIRECT_CACHE_SIZE)
+
+class ConnectionPool:
+    """Thread'lere kalıcı SQLite bağlantıları dağıtan sınırlı havuz"""
+
+    def __init__(self, path, size: int, pragmas=()):
+        self.path = path
+        self.size = size
+        self.pragmas = list(pragmas)
+        self._idle = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self.acquires = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        # PRAGMA'lar bağlantı başına yalnızca bir kez uygulanır
+        for pragma in self.pragmas:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        last = getattr(self._local, "last", None)
+        start = time.perf_counter()
+        conn = None
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                self._cond.wait()
+            if self._idle:
+                # Mümkünse bu thread'in daha önce kullandığı bağlantıyı ver
+                if last is not None and any(c is last for c in self._idle):
+                    self._idle = [c for c in self._idle if c is not last]
+                    conn = last
+                else:
+                    conn = self._idle.pop()
+            else:
+                self._created += 1
+            waited = time.perf_counter() - start
+            self.acquires += 1
+            if waited > 0.001:
+                self.waits += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        pool_wait.observe(waited)
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        self._local.last = conn
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        held = getattr(self._local, "held", None)
+        if held is not None:
+            # Aynı thread içinde iç içe kullanımda aynı bağlantı paylaşılır
+            with held:
+                yield held
+            return
+        conn = self.acquire()
+        self._local.held = conn
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._local.held = None
+            self.release(conn)
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "idle": len(self._idle),
+                "acquires": self.acquires,
+                "waits": self.waits,
+                "wait_avg_ms": self.wait_total / self.acquires * 1000 if self.acquires else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+# Kısa kod olamayacak, uygulamanın kendi kullandığı ilk yol parçaları
+RESERVED_PATHS = frozenset({
+    "api", "shorten", "urls", "stats", "static", "docs", "redoc",
+    "openapi.json", "favicon.ico", "robots.txt", "metrics", "admin",
+})
+_CODE_RE = re.compile(r"[a-zA-Z0-9]{1,%d}" % NUMERIC_CODE_LEN)
+ALIAS_PATTERN = r"[A-Za-z0-9_-]{3,64}"
+_ALIAS_RE = re.compile(ALIAS_PATTERN)
+
+def is_alias(code: str) -> bool:
+    """Sayısal kod olarak çözülemeyen, geçerli biçimdeki takma adlar"""
+    return code not in RESERVED_PATHS and _CODE_RE.fullmatch(code) is None and _ALIAS_RE.fullmatch(code) is not None
+
+def parse_code(code: str) -> Optional[int]:
+    """Sayısal kısa kodu id'ye çevirir; takma ad, geçersiz ya da ayrılmış kodlarda None döndürür"""
+    if code in RESERVED_PATHS or _CODE_RE.fullmatch(code) is None:
+        return None
+    return decode_id(code)
+
+# SQLite performans profilleri (cache_size negatifse KiB cinsindendir)
+SQLITE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+def resolve_profile(profile=None) -> dict:
+    """Profil adını ya da sözlüğünü PRAGMA ayarlarına çevirir"""
+    if profile is None:
+        profile = SQLITE_PROFILE
+    if isinstance(profile, str):
+        try:
+            return dict(SQLITE_PROFILES[profile])
+        except KeyError:
+            raise ValueError(f"Bilinmeyen SQLite profili: {profile}") from None
+    return {**SQLITE_PROFILES["balanced"], **profile}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url: str) -> str:
+    """Dedup için URL'yi normalize eder (şema/host küçük harf, varsayılan port, son eğik çizgi, sıralı query)"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username is not None:
+        userinfo = parts.username + (f":{parts.password}" if parts.password is not None else "")
+        host = f"{userinfo}@{host}"
+    path = parts.path.rstrip("/") or "/"
+    query = "&".join(sorted(p for p in parts.query.split("&") if p))
+    return urlunsplit((scheme, host, path, query, parts.fragment))
+
+def url_hash(normalized: str) -> int:
+    """Normalize edilmiş URL'nin işaretli 64 bit hash'i (SQLite INTEGER'a sığar)"""
+    return int.from_bytes(hashlib.blake2b(normalized.encode(), digest_size=8).digest(), "big", signed=True)
+
+def _migrate_url_hash(conn: sqlite3.Connection):
+    """url_hash sütunu olmayan eski veritabanlarını yükseltir"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(urls)")}
+    if "url_hash" not in columns:
+        conn.execute("ALTER TABLE urls ADD COLUMN url_hash INTEGER")
+    conn.create_function("url_hash", 1, lambda url: url_hash(normalize_url(url)), deterministic=True)
+    migrated = 0
+    while True:
+        # Küçük partiler halinde doldur ki yazıcı kilidi uzun tutulmasın
+        cur = conn.execute(
+            "UPDATE urls SET url_hash = url_hash(original_url) "
+            "WHERE id IN (SELECT id FROM urls WHERE url_hash IS NULL LIMIT 10000)"
+        )
+        conn.commit()
+        if cur.rowcount <= 0:
+            break
+        migrated += cur.rowcount
+    if migrated:
+        logger.info("url_hash sütunu %d satır için dolduruldu", migrated)
+
+def _migrate_expires_at(conn: sqlite3.Connection):
+    """expires_at sütununu ekler; yalnızca süresi olan satırları içeren kısmi indeks reaper içindir"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(urls)")}
+    if "expires_at" not in columns:
+        conn.execute("ALTER TABLE urls ADD COLUMN expires_at REAL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_expires_at ON urls(expires_at) WHERE expires_at IS NOT NULL")
+
+def _migrate_lease_heartbeat(conn: sqlite3.Connection):
+    """id_leases'e updated_at ekler; eski kiralar bayat sayılır, sahipleri yaşıyorsa yeni blok alır"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(id_leases)")}
+    if "updated_at" not in columns:
+        conn.execute("ALTER TABLE id_leases ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+
+# ============ Depolama ============
+# Özet tablosu başına kova genişliği (saniye)
+ROLLUP_TABLES = {"minute": "clicks_minute", "hour": "clicks_hour", "day": "clicks_day"}
+BUCKET_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+
+class Storage(Protocol):
+    """Handler'ların konuştuğu depolama arayüzü; tüm metotlar senkron ve thread-safe"""
+    shards: int
+    # read_only: yazma uç noktaları kapalı; blocking=False: okumalar event loop'ta yapılabilir
+    read_only: bool
+    blocking: bool
+
+    def init(self, profile=None) -> dict: ...
+    def close(self) -> None: ...
+    def shard_for_url(self, url: str) -> int: ...
+    def shard_for_id(self, url_id: int) -> int: ...
+    def partition(self, urls: list) -> dict: ...
+    def shard_for_alias(self, alias: str) -> int: ...
+    def get_by_id(self, url_id: int) -> Optional[tuple]: ...
+    def get_or_create(self, url: str, expires_at: Optional[float] = None) -> int: ...
+    def bulk_create(self, urls: list) -> dict: ...
+    def create_alias(self, url: str, alias: str, expires_at: Optional[float] = None) -> Optional[int]: ...
+    def get_alias(self, alias: str) -> Optional[int]: ...
+    def incr_clicks(self, counts: dict) -> None: ...
+    def list_page(self, after: Optional[int], limit: int) -> list: ...
+    def delete(self, url_id: int) -> bool: ...
+    def record_clicks(self, events: list, rollups: dict) -> None: ...
+    def click_series(self, url_id: int, bucket: str, start: int, end: int) -> Optional[list]: ...
+    def stats(self) -> dict: ...
+    def might_exist(self, url_id: int) -> bool: ...
+    def refresh_filter(self) -> None: ...
+    def expired_count(self, now: float) -> int: ...
+    def reap_expired(self, now: float, limit: int, shard: Optional[int] = None) -> list: ...
+
+class _SingleShard:
+    """Tek dosyalı motorlar için shard yardımcıları: her şey shard 0'dadır"""
+    shards = 1
+    read_only = False
+    blocking = True
+
+    def shard_for_url(self, url: str) -> int:
+        return 0
+
+    def shard_for_id(self, url_id: int) -> int:
+        return 0
+
+    def partition(self, urls: list) -> dict:
+        return {0: urls} if urls else {}
+
+    def shard_for_alias(self, alias: str) -> int:
+        return 0
+
+class IdAllocator:
+    """hi/lo id ayırıcı: id_blocks sayacından blok ayırır, id'leri bellekten dağıtır.
+
+    Blok ayırma kendi BEGIN IMMEDIATE işleminde yapılıp hemen commit edilir;
+    böylece aynı dosyayı kullanan uvicorn worker'ları hiçbir zaman aynı
+    aralığı alamaz. Kullanılmayan id'ler boşluk olarak kalır, tekrar verilmez.
+    Kira heartbeat() ile tazelenir; lease_ttl boyunca tazelenmeyen kiralar
+    kapanmadan ölen worker'lara aittir ve silinir.
+    """
+
+    def __init__(self, block_size: int, on_reserve=None, lease_ttl: float = ID_LEASE_TTL):
+        self.block_size = block_size
+        self.on_reserve = on_reserve
+        self.lease_ttl = lease_ttl
+        self._beat = 0.0
+        self.leases_dropped = 0
+        # id_leases'teki satırın anahtarı; açık blok başka worker'ların negatif filtresine bildirilir
+        self.owner = f"{os.getpid()}-{os.urandom(4).hex()}"
+        self._lock = threading.Lock()
+        self._next = self._end = 0
+        self._start = 0
+        self.blocks = 0
+
+    def take(self, conn: sqlite3.Connection, n: int = 1) -> list:
+        """n adet id döndürür; conn açık bir işlem içinde olmamalıdır"""
+        ids = []
+        with self._lock:
+            while len(ids) < n:
+                if self._next >= self._end:
+                    self._next, self._end = self._reserve(conn, max(self.block_size, n - len(ids)))
+                count = min(n - len(ids), self._end - self._next)
+                ids.extend(range(self._next, self._next + count))
+                self._next += count
+        return ids
+
+    def _reserve(self, conn: sqlite3.Connection, size: int):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE id_blocks SET next_id = next_id + ? WHERE name = 'urls'", (size,))
+            end = conn.execute("SELECT next_id FROM id_blocks WHERE name = 'urls'").fetchone()[0]
+            # Kira önceki bloğu da kapsar: ondan verilmiş ama henüz eklenmemiş id'ler olabilir
+            start = self._start if self._end else end - size
+            conn.execute(
+                "INSERT INTO id_leases (owner, start_id, end_id, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (owner) DO UPDATE SET start_id = excluded.start_id, end_id = excluded.end_id, "
+                "updated_at = excluded.updated_at",
+                (self.owner, start, end, time.time())
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        self.blocks += 1
+        self._start = end - size
+        if self.on_reserve is not None:
+            self.on_reserve(end)
+        return end - size, end
+
+    def heartbeat(self, conn: sqlite3.Connection, now: float) -> int:
+        """Kirayı tazeler ve tavanın altına düşmüş bayat kiraları siler; silinen kira sayısını döndürür.
+
+        Yazma işlemi lease_ttl / 4'te bir yapılır. Bu sürecin kirası da silinmişse
+        (lease_ttl'den uzun bir duraklama) açık blok bırakılır, sonraki id'ler
+        kiralı yeni bir bloktan gelir.
+        """
+        if now - self._beat < self.lease_ttl / 4:
+            return 0
+        self._beat = now
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                alive = conn.execute(
+                    "UPDATE id_leases SET updated_at = ? WHERE owner = ?", (now, self.owner)
+                ).rowcount
+                dropped = conn.execute(
+                    "DELETE FROM id_leases WHERE updated_at < ? "
+                    "AND end_id <= (SELECT next_id FROM id_blocks WHERE name = 'urls')",
+                    (now - self.lease_ttl,)
+                ).rowcount
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            if self._end and not alive:
+                logger.warning("id kirası bayat sayılıp silinmiş; açık blok bırakıldı")
+                self._next = self._end = self._start = 0
+        if dropped:
+            logger.info("%d bayat id kirası silindi", dropped)
+            self.leases_dropped += dropped
+        return dropped
+
+    def release(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._next = self._end = self._start = 0
+        conn.execute("DELETE FROM id_leases WHERE owner = ?", (self.owner,))
+
+    def reset(self):
+        with self._lock:
+            self._next = self._end = self._start = 0
+
+    def stats(self) -> dict:
+        return {
+            "block_size": self.block_size, "blocks": self.blocks,
+            "remaining": self._end - self._next, "leases_dropped": self.leases_dropped,
+        }
+
+class IdFilter:
+    """Var olan id'lerin bit haritası; yokluğu kesin olan kodları DB'ye gitmeden eler.
+
+    Son eşitlemede okunan id_blocks sayacının (tavan) altındaki id'ler, o anda
+    açık olan id kiraları (başka worker'ların henüz bitmemiş blokları) dışında
+    tam olarak bilinir. Kiralar, tavanın hemen üstü ve bu süreçte yeni ayrılan
+    bloklar "bilinmiyor" sayılır ve DB'ye bırakılır; böylece yanlış 404 olmaz.
+    Başka worker'ların sildiği id'ler bir sonraki DB sorgusunda 404'e düşer.
+    """
+
+    def __init__(self, max_ids: int, headroom: int):
+        self.max_ids = max_ids
+        self.headroom = headroom
+        self._lock = threading.Lock()
+        self._bits = bytearray()
+        # (tavan, bilinmeyen aralıklar) tek demet olarak değiştirilir ki okuyucular tutarlı görsün
+        self._view = None
+        self._reserved_end = 0
+        self.refreshes = 0
+        self.refresh_ms = 0.0
+
+    def might_exist(self, url_id: int) -> bool:
+        view = self._view
+        if view is None:
+            return True
+        ceiling, unknown = view
+        if url_id >= ceiling:
+            return url_id < max(ceiling + self.headroom, self._reserved_end)
+        for start, end in unknown:
+            if start <= url_id < end:
+                return True
+        bits = self._bits
+        byte = url_id >> 3
+        return byte < len(bits) and bool(bits[byte] >> (url_id & 7) & 1)
+
+    def _grow(self, size: int):
+        if size > len(self._bits):
+            # Yeni dizi önce doldurulup sonra atanır; okuyucular hiçbir zaman yarım dizi görmez
+            bits = bytearray(max(size, len(self._bits) * 5 // 4))
+            bits[:len(self._bits)] = self._bits
+            self._bits = bits
+
+    def add(self, ids):
+        with self._lock:
+            if self._view is None:
+                return
+            for url_id in ids:
+                self._grow((url_id >> 3) + 1)
+                self._bits[url_id >> 3] |= 1 << (url_id & 7)
+
+    def discard(self, url_id: int):
+        with self._lock:
+            if (url_id >> 3) < len(self._bits):
+                self._bits[url_id >> 3] &= ~(1 << (url_id & 7)) & 0xFF
+
+    def reset(self):
+        with self._lock:
+            self._bits = bytearray()
+            self._view = None
+            self._reserved_end = 0
+
+    def reserved(self, end: int):
+        """Bu sürecin ayırdığı blok; tavan güncellenene kadar bilinmeyen bölgeye katılır"""
+        self._reserved_end = max(self._reserved_end, end)
+
+    def refresh(self, conn: sqlite3.Connection, owner: str):
+        """Önceki turdan beri bilinmeyen aralıkları tek bir okuma anlık görüntüsünde tarar.
+
+        Bu sürecin kendi kirası bilinmeyen sayılmaz: kendi eklemeleri add() ile
+        commit'ten hemen sonra, kod istemciye dönmeden işaretlenir.
+        """
+        started = time.perf_counter()
+        conn.execute("BEGIN")
+        try:
+            ceiling = conn.execute("SELECT next_id FROM id_blocks WHERE name = 'urls'").fetchone()[0]
+            leases = tuple(conn.execute(
+                "SELECT start_id, end_id FROM id_leases WHERE owner != ?", (owner,)
+            ).fetchall())
+            if ceiling > self.max_ids:
+                if self._view is not None:
+                    logger.warning("Negatif filtre kapatıldı: %d id sınırı aşıldı", self.max_ids)
+                self._view = None
+                self._bits = bytearray()
+                return
+            if self._view is None:
+                ranges = [(0, ceiling)]
+            else:
+                old_ceiling, old_unknown = self._view
+                ranges = [*old_unknown, (old_ceiling, ceiling)]
+                if ceiling - old_ceiling > self.headroom:
+                    logger.warning(
+                        "Negatif filtre: sayaç bir turda %d ilerledi, pay %d'e çıkarıldı",
+                        ceiling - old_ceiling, 2 * (ceiling - old_ceiling)
+                    )
+                    self.headroom = 2 * (ceiling - old_ceiling)
+            # Bitler imleç dolaşılırken yalnızca taranan aralığı kapsayan yerel bir diziye yazılır;
+            # id'ler hiçbir zaman Python listesinde tutulmaz
+            base = min((start for start, _ in ranges), default=0) >> 3
+            found = bytearray(max(0, (max((end for _, end in ranges), default=0) + 7 >> 3) - base))
+            for start, end in ranges:
+                for (url_id,) in conn.execute("SELECT id FROM urls WHERE id >= ? AND id < ?", (start, end)):
+                    found[(url_id >> 3) - base] |= 1 << (url_id & 7)
+        finally:
+            conn.commit()
+        with self._lock:
+            self._grow((ceiling >> 3) + 1)
+            if found:
+                # Bu süreçte add() ile işaretlenen bitler korunur: bölge tek seferde OR'lanır
+                end = base + len(found)
+                merged = int.from_bytes(self._bits[base:end], "little") | int.from_bytes(found, "little")
+                self._bits[base:end] = merged.to_bytes(len(found), "little")
+            self._view = (ceiling, leases)
+        self.refreshes += 1
+        self.refresh_ms = (time.perf_counter() - started) * 1000
+
+    def stats(self) -> dict:
+        view = self._view
+        return {
+            "enabled": view is not None,
+            "ids": int.from_bytes(self._bits, "little").bit_count(),
+            "bytes": len(self._bits),
+            "ceiling": view[0] if view else None,
+            "unknown_ranges": len(view[1]) if view else None,
+            "headroom": self.headroom,
+            "refreshes": self.refreshes,
+            "last_refresh_ms": round(self.refresh_ms, 3),
+        }
+
+class SQLiteStorage(_SingleShard):
+    """Tek bir SQLite dosyası üzerinde çalışan varsayılan depolama motoru"""
+
+    def __init__(self, path, pool_size: int = DB_POOL_SIZE, pragmas=DB_PRAGMAS):
+        self.path = path
+        self.extra_pragmas = list(pragmas)
+        self.pool = ConnectionPool(path, pool_size, self.extra_pragmas)
+        self.filter = IdFilter(NEGATIVE_FILTER_MAX_IDS, NEGATIVE_FILTER_HEADROOM) if NEGATIVE_FILTER else None
+        self.ids = IdAllocator(ID_BLOCK_SIZE, self.filter.reserved if self.filter else None)
+
+    def connection(self):
+        return self.pool.connection()
+
+    def init(self, profile=None) -> dict:
+        settings = resolve_profile(profile)
+        # journal_mode veritabanı dosyasında kalıcıdır, diğerleri bağlantı başına uygulanır
+        self.pool.pragmas = [
+            f"{name} = {value}" for name, value in settings.items() if name != "journal_mode"
+        ] + self.extra_pragmas
+        self.pool.close()
+        self.ids.reset()
+        with self.connection() as conn:
+            conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS urls (
+                    id INTEGER PRIMARY KEY,
+                    original_url TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL,
+                    clicks INTEGER DEFAULT 0,
+                    url_hash INTEGER,
+                    expires_at REAL
+                )
+            """)
+            _migrate_url_hash(conn)
+            _migrate_expires_at(conn)
+            # id'ler AUTOINCREMENT yerine IdAllocator bloklarından gelir; sayaç mevcut
+            # en büyük id'nin (ve eski sqlite_sequence değerinin) altına hiç inmez
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS id_blocks (
+                    name TEXT PRIMARY KEY,
+                    next_id INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+            floor = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM urls").fetchone()[0]
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'"
+            ).fetchone():
+                row = conn.execute("SELECT seq + 1 FROM sqlite_sequence WHERE name = 'urls'").fetchone()
+                floor = max(floor, row[0] if row else 0)
+            conn.execute(
+                "INSERT INTO id_blocks (name, next_id) VALUES ('urls', ?) "
+                "ON CONFLICT (name) DO UPDATE SET next_id = MAX(next_id, excluded.next_id)",
+                (floor,)
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS id_leases (
+                    owner TEXT PRIMARY KEY,
+                    start_id INTEGER NOT NULL,
+                    end_id INTEGER NOT NULL,
+                    updated_at REAL NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+            """)
+            _migrate_lease_heartbeat(conn)
+            # Takma adlar ayrı bir ad alanıdır; birincil anahtar eşzamanlı eklemelerde çakışmayı çözer
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS aliases (
+                    alias TEXT PRIMARY KEY,
+                    url_id INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_aliases_url_id ON aliases(url_id)")
+            # Dedup, ham metin yerine normalize edilmiş URL'nin 64 bit hash'i üzerinden yapılır
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_url_hash ON urls(url_hash)")
+            conn.execute("DROP INDEX IF EXISTS idx_original_url")
+            # Ham tıklama olayları (yalnızca eklenir) ve dakika/saat/gün özetleri
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS click_events (
+                    id INTEGER PRIMARY KEY,
+                    url_id INTEGER NOT NULL,
+                    ts REAL NOT NULL,
+                    referrer TEXT,
+                    ua_class TEXT NOT NULL
+                )
+            """)
+            for table in ROLLUP_TABLES.values():
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        url_id INTEGER NOT NULL,
+                        bucket INTEGER NOT NULL,
+                        clicks INTEGER NOT NULL,
+                        PRIMARY KEY (url_id, bucket)
+                    ) WITHOUT ROWID
+                """)
+            effective = {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in settings
+            }
+        name = profile if isinstance(profile, str) else (SQLITE_PROFILE if profile is None else "custom")
+        logger.info(
+            "SQLite profili '%s': %s", name,
+            ", ".join(f"{k}={v}" for k, v in effective.items())
+        )
+        if self.filter is not None:
+            # İlk tam tarama açılışı bekletmez; FilterRefresher'ın ilk turunda yapılır,
+            # o zamana kadar filtre her id'yi "olabilir" sayar
+            self.filter.reset()
+        return effective
+
+    def close(self):
+        if self.ids.blocks:
+            with self.connection() as conn:
+                self.ids.release(conn)
+        self.pool.close()
+
+    def get_by_id(self, url_id: int) -> Optional[tuple]:
+        """(original_url, expires_at) ya da None"""
+        with self.connection() as conn:
+            return conn.execute("SELECT original_url, expires_at FROM urls WHERE id = ?", (url_id,)).fetchone()
+
+    def _find(self, conn: sqlite3.Connection, url: str, key: str) -> Optional[int]:
+        # Hash çakışmaları tam metin karşılaştırmasıyla çözülür; süreli ve takma adlı linkler dedup'a girmez
+        for url_id, candidate in conn.execute(
+            "SELECT id, original_url FROM urls WHERE url_hash = ? AND expires_at IS NULL "
+            "AND NOT EXISTS (SELECT 1 FROM aliases WHERE url_id = urls.id) ORDER BY id",
+            (url_hash(key),)
+        ):
+            if candidate == url or normalize_url(candidate) == key:
+                return url_id
+        return None
+
+    def get_or_create(self, url: str, expires_at: Optional[float] = None) -> int:
+        key = normalize_url(url)
+        with self.connection() as conn:
+            if expires_at is not None:
+                # Süreli link her zaman yeni bir koddur; kalıcı bir linkle birleştirilmez
+                (new_id,) = self.ids.take(conn)
+                conn.execute(
+                    "INSERT INTO urls (id, original_url, url_hash, created_at, clicks, expires_at) "
+                    "VALUES (?, ?, ?, ?, 0, ?)",
+                    (new_id, url, url_hash(key), datetime.utcnow(), expires_at)
+                )
+                if self.filter is not None:
+                    self.filter.add((new_id,))
+                return new_id
+            url_id = self._find(conn, url, key)
+            if url_id is not None:
+                return url_id
+            # Kod, yazma işlemi açılmadan bellekteki bloktan belirlenir
+            (new_id,) = self.ids.take(conn)
+            # Benzersiz indeks olmadığı için ekleme öncesi kontrol yazıcı kilidi altında tekrarlanır
+            conn.execute("BEGIN IMMEDIATE")
+            url_id = self._find(conn, url, key)
+            if url_id is not None:
+                return url_id
+            conn.execute(
+                "INSERT INTO urls (id, original_url, url_hash, created_at, clicks) VALUES (?, ?, ?, ?, 0)",
+                (new_id, url, url_hash(key), datetime.utcnow())
+            )
+        if self.filter is not None:
+            self.filter.add((new_id,))
+        return new_id
+
+    def create_alias(self, url: str, alias: str, expires_at: Optional[float] = None) -> Optional[int]:
+        """Takma adlı yeni bir link ekler; ad alınmışsa None"""
+        with self.connection() as conn:
+            if conn.execute("SELECT 1 FROM aliases WHERE alias = ?", (alias,)).fetchone():
+                return None
+            (new_id,) = self.ids.take(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("INSERT INTO aliases (alias, url_id) VALUES (?, ?)", (alias, new_id))
+            except sqlite3.IntegrityError:
+                # Aynı adı eşzamanlı bir istek aldı; ayrılan id boşluk olarak kalır
+                return None
+            conn.execute(
+                "INSERT INTO urls (id, original_url, url_hash, created_at, clicks, expires_at) "
+                "VALUES (?, ?, ?, ?, 0, ?)",
+                (new_id, url, url_hash(normalize_url(url)), datetime.utcnow(), expires_at)
+            )
+        if self.filter is not None:
+            self.filter.add((new_id,))
+        return new_id
+
+    def get_alias(self, alias: str) -> Optional[int]:
+        with self.connection() as conn:
+            row = conn.execute("SELECT url_id FROM aliases WHERE alias = ?", (alias,)).fetchone()
+        return row[0] if row else None
+
+    def _match_hashes(self, conn: sqlite3.Connection, hashes: list, ids: dict):
+        placeholders = ",".join("?" * len(hashes))
+        for url_id, candidate in conn.execute(
+            f"SELECT id, original_url FROM urls WHERE url_hash IN ({placeholders}) AND expires_at IS NULL "
+            "AND NOT EXISTS (SELECT 1 FROM aliases WHERE url_id = urls.id) ORDER BY id",
+            hashes
+        ):
+            ids.setdefault(normalize_url(candidate), url_id)
+
+    def bulk_create(self, urls: list) -> dict:
+        """Bir chunk için mevcutları tek sorguda bulur, eksikleri executemany ile ekler"""
+        keys = {url: normalize_url(url) for url in dict.fromkeys(urls)}
+        hashes = {key: url_hash(key) for key in keys.values()}
+        ids = {}
+        with self.connection() as conn:
+            self._match_hashes(conn, list(set(hashes.values())), ids)
+            missing = {}
+            for url, key in keys.items():
+                if key not in ids:
+                    missing.setdefault(key, url)
+            if not missing:
+                return {url: ids[key] for url, key in keys.items()}
+            reserved = dict(zip(missing, self.ids.take(conn, len(missing))))
+            conn.execute("BEGIN IMMEDIATE")
+            # Arada başka bir worker eklemiş olabilir; onlar için ayrılan id'ler boşluk kalır
+            self._match_hashes(conn, list({hashes[key] for key in missing}), ids)
+            now = datetime.utcnow()
+            rows = [
+                (reserved[key], url, hashes[key], now) for key, url in missing.items() if key not in ids
+            ]
+            conn.executemany(
+                "INSERT INTO urls (id, original_url, url_hash, created_at, clicks) VALUES (?, ?, ?, ?, 0)", rows
+            )
+            for url_id, url, _, _ in rows:
+                ids[keys[url]] = url_id
+        if self.filter is not None:
+            self.filter.add(row[0] for row in rows)
+        return {url: ids[key] for url, key in keys.items()}
+
+    def incr_clicks(self, counts: dict):
+        with self.connection() as conn:
+            conn.executemany(
+                "UPDATE urls SET clicks = clicks + ? WHERE id = ?",
+                [(n, url_id) for url_id, n in counts.items()]
+            )
+
+    def list_page(self, after: Optional[int], limit: int) -> list:
+        # Keyset sayfalama: id (rowid) indeksinde geriye doğru tarama, OFFSET yok;
+        # takma ad satır başına idx_aliases_url_id üzerinden bulunur
+        query = (
+            "SELECT u.id, u.original_url, u.created_at, u.clicks, u.expires_at, a.alias "
+            "FROM urls u LEFT JOIN aliases a ON a.url_id = u.id "
+        )
+        with self.connection() as conn:
+            if after is None:
+                return conn.execute(query + "ORDER BY u.id DESC LIMIT ?", (limit,)).fetchall()
+            return conn.execute(query + "WHERE u.id < ? ORDER BY u.id DESC LIMIT ?", (after, limit)).fetchall()
+
+    def delete(self, url_id: int) -> bool:
+        with self.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM urls WHERE id = ?", (url_id,))
+            if cur.rowcount == 0:
+                return False
+            cur.execute("DELETE FROM aliases WHERE url_id = ?", (url_id,))
+            for table in ROLLUP_TABLES.values():
+                cur.execute(f"DELETE FROM {table} WHERE url_id = ?", (url_id,))
+        if self.filter is not None:
+            self.filter.discard(url_id)
+        return True
+
+    def record_clicks(self, events: list, rollups: dict):
+        with self.connection() as conn:
+            conn.executemany(
+                "INSERT INTO click_events (url_id, ts, referrer, ua_class) VALUES (?, ?, ?, ?)", events
+            )
+            for period, counts in rollups.items():
+                conn.executemany(
+                    f"INSERT INTO {ROLLUP_TABLES[period]} (url_id, bucket, clicks) VALUES (?, ?, ?) "
+                    "ON CONFLICT (url_id, bucket) DO UPDATE SET clicks = clicks + excluded.clicks",
+                    [(url_id, bucket, n) for (url_id, bucket), n in counts.items()]
+                )
+
+    def click_series(self, url_id: int, bucket: str, start: int, end: int) -> Optional[list]:
+        with self.connection() as conn:
+            if conn.execute("SELECT 1 FROM urls WHERE id = ?", (url_id,)).fetchone() is None:
+                return None
+            # Birincil anahtar (url_id, bucket) üzerinde aralık taraması
+            return conn.execute(
+                f"SELECT bucket, clicks FROM {ROLLUP_TABLES[bucket]} "
+                "WHERE url_id = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                (url_id, start, end)
+            ).fetchall()
+
+    def stats(self) -> dict:
+        return {
+            "engine": "sqlite", "pool": self.pool.stats(), "ids": self.ids.stats(),
+            "negative_filter": self.filter.stats() if self.filter else None,
+        }
+
+    def might_exist(self, url_id: int) -> bool:
+        return self.filter is None or self.filter.might_exist(url_id)
+
+    def refresh_filter(self):
+        if self.filter is not None:
+            with self.connection() as conn:
+                # Ölü worker'ların kiraları silinmezse her eşitlemede yeniden taranırdı
+                self.ids.heartbeat(conn, time.time())
+                self.filter.refresh(conn, self.ids.owner)
+
+    def expired_count(self, now: float) -> int:
+        with self.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM urls WHERE expires_at <= ?", (now,)).fetchone()[0]
+
+    def reap_expired(self, now: float, limit: int, shard: Optional[int] = None) -> list:
+        """En fazla limit süresi dolmuş satırı tek kısa işlemde siler, silinen id'leri döndürür"""
+        with self.connection() as conn:
+            # Alt sorgu idx_expires_at kısmi indeksinde en eskiden başlayan bir aralık taramasıdır
+            ids = [row[0] for row in conn.execute(
+                "DELETE FROM urls WHERE id IN "
+                "(SELECT id FROM urls WHERE expires_at <= ? ORDER BY expires_at LIMIT ?) RETURNING id",
+                (now, limit)
+            )]
+            if ids:
+                placeholders = ",".join("?" * len(ids))
+                for table in ("aliases", *ROLLUP_TABLES.values()):
+                    conn.execute(f"DELETE FROM {table} WHERE url_id IN ({placeholders})", ids)
+        if self.filter is not None:
+            for url_id in ids:
+                self.filter.discard(url_id)
+        return ids
+
+class MemoryStorage(_SingleShard):
+    """Sözlük tabanlı, kalıcı olmayan motor (benchmark ve testler için)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._ids = []
+        self._by_key = {}
+        self._aliases = {}
+        self._next_id = 1
+        # (expires_at, id) min-heap'i; silinmiş id'ler reap sırasında atlanır
+        self._expiry = []
+        self._events = []
+        self._rollups = {period: Counter() for period in ROLLUP_TABLES}
+
+    def init(self, profile=None) -> dict:
+        logger.info("Bellek içi depolama kullanılıyor; veriler kalıcı değil")
+        return {}
+
+    def close(self):
+        pass
+
+    def get_by_id(self, url_id: int) -> Optional[tuple]:
+        row = self._rows.get(url_id)
+        return (row[0], row[3]) if row else None
+
+    def _create(self, url: str, key: str, expires_at: Optional[float] = None, alias: Optional[str] = None) -> int:
+        url_id = self._next_id
+        self._next_id += 1
+        self._rows[url_id] = [url, str(datetime.utcnow()), 0, expires_at, alias]
+        self._ids.append(url_id)
+        if alias is not None:
+            self._aliases[alias] = url_id
+        if expires_at is not None:
+            heapq.heappush(self._expiry, (expires_at, url_id))
+        elif alias is None:
+            # SQLite'taki gibi dedup en eski kalıcı, takma adsız satıra gider
+            self._by_key.setdefault(key, url_id)
+        return url_id
+
+    def get_or_create(self, url: str, expires_at: Optional[float] = None) -> int:
+        key = normalize_url(url)
+        with self._lock:
+            if expires_at is not None:
+                return self._create(url, key, expires_at)
+            url_id = self._by_key.get(key)
+            return url_id if url_id is not None else self._create(url, key)
+
+    def bulk_create(self, urls: list) -> dict:
+        keys = {url: normalize_url(url) for url in dict.fromkeys(urls)}
+        with self._lock:
+            ids = {}
+            for url, key in keys.items():
+                url_id = self._by_key.get(key)
+                ids[url] = url_id if url_id is not None else self._create(url, key)
+        return ids
+
+    def create_alias(self, url: str, alias: str, expires_at: Optional[float] = None) -> Optional[int]:
+        with self._lock:
+            if alias in self._aliases:
+                return None
+            return self._create(url, normalize_url(url), expires_at, alias)
+
+    def get_alias(self, alias: str) -> Optional[int]:
+        return self._aliases.get(alias)
+
+    def incr_clicks(self, counts: dict):
+        with self._lock:
+            for url_id, n in counts.items():
+                row = self._rows.get(url_id)
+                if row is not None:
+                    row[2] += n
+
+    def list_page(self, after: Optional[int], limit: int) -> list:
+        with self._lock:
+            # _ids artan sırada tutulur; after'dan küçük en büyük id'den geriye yürünür
+            end = len(self._ids) if after is None else bisect.bisect_left(self._ids, after)
+            ids = self._ids[max(0, end - limit):end]
+            return [(url_id, *self._rows[url_id]) for url_id in reversed(ids)]
+
+    def _remove(self, url_id: int) -> bool:
+        row = self._rows.pop(url_id, None)
+        if row is None:
+            return False
+        del self._ids[bisect.bisect_left(self._ids, url_id)]
+        key = normalize_url(row[0])
+        if self._by_key.get(key) == url_id:
+            del self._by_key[key]
+        if row[4] is not None:
+            del self._aliases[row[4]]
+        for counts in self._rollups.values():
+            for bucket_key in [k for k in counts if k[0] == url_id]:
+                del counts[bucket_key]
+        return True
+
+    def delete(self, url_id: int) -> bool:
+        with self._lock:
+            return self._remove(url_id)
+
+    def record_clicks(self, events: list, rollups: dict):
+        with self._lock:
+            self._events.extend(events)
+            for period, counts in rollups.items():
+                self._rollups[period].update(counts)
+
+    def click_series(self, url_id: int, bucket: str, start: int, end: int) -> Optional[list]:
+        with self._lock:
+            if url_id not in self._rows:
+                return None
+            return sorted(
+                (b, n) for (i, b), n in self._rollups[bucket].items() if i == url_id and start <= b < end
+            )
+
+    def stats(self) -> dict:
+        return {"engine": "memory", "urls": len(self._rows), "events": len(self._events)}
+
+    def might_exist(self, url_id: int) -> bool:
+        # Tüm veri bellekte; sözlük araması zaten kesin cevap verir
+        return url_id in self._rows
+
+    def refresh_filter(self):
+        pass
+
+    def expired_count(self, now: float) -> int:
+        with self._lock:
+            return sum(1 for expires_at, url_id in self._expiry if expires_at <= now and url_id in self._rows)
+
+    def reap_expired(self, now: float, limit: int, shard: Optional[int] = None) -> list:
+        ids = []
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now and len(ids) < limit:
+                _, url_id = heapq.heappop(self._expiry)
+                if self._remove(url_id):
+                    ids.append(url_id)
+        return ids
+
+class ShardedStorage:
+    """Id'leri N ayrı SQLite dosyasına dağıtan motor; her shard'ın kendi havuzu ve yazıcısı vardır.
+
+    Global id = yerel id * N + shard; shard doğrudan base62_decode çıktısından
+    (id % N) bulunur. Yeni URL'nin shard'ı url_hash % N olduğundan aynı URL hep
+    aynı dosyaya düşer ve dedup shard içinde kalır. N veri yazıldıktan sonra
+    değiştirilmemelidir.
+    """
+
+    read_only = False
+    blocking = True
+
+    def __init__(self, path, shards: int, pool_size: int = DB_POOL_SIZE, pragmas=DB_PRAGMAS):
+        path = Path(path)
+        self.shards = shards
+        self.engines = [
+            SQLiteStorage(path.with_name(f"{path.stem}.{i}{path.suffix}"), pool_size, pragmas)
+            for i in range(shards)
+        ]
+
+    def init(self, profile=None) -> dict:
+        effective = {}
+        for engine in self.engines:
+            effective = engine.init(profile)
+        return effective
+
+    def close(self):
+        for engine in self.engines:
+            engine.close()
+
+    def shard_for_url(self, url: str) -> int:
+        return url_hash(normalize_url(url)) % self.shards
+
+    def shard_for_id(self, url_id: int) -> int:
+        return url_id % self.shards
+
+    def partition(self, urls: list) -> dict:
+        groups = {}
+        for url in urls:
+            groups.setdefault(self.shard_for_url(url), []).append(url)
+        return groups
+
+    def shard_for_alias(self, alias: str) -> int:
+        # Takma adlı link, adın kendi shard'ına yazılır; ad ve satır aynı işlemde eklenir
+        return url_hash(alias) % self.shards
+
+    def _split(self, url_id: int):
+        return self.engines[url_id % self.shards], url_id // self.shards
+
+    def _by_shard(self, items):
+        """(global id, değer) çiftlerini shard -> [(yerel id, değer)] olarak gruplar"""
+        groups = {}
+        for url_id, value in items:
+            groups.setdefault(url_id % self.shards, []).append((url_id // self.shards, value))
+        return groups
+
+    def get_by_id(self, url_id: int) -> Optional[tuple]:
+        engine, local = self._split(url_id)
+        return engine.get_by_id(local)
+
+    def get_or_create(self, url: str, expires_at: Optional[float] = None) -> int:
+        shard = self.shard_for_url(url)
+        return self.engines[shard].get_or_create(url, expires_at) * self.shards + shard
+
+    def bulk_create(self, urls: list) -> dict:
+        ids = {}
+        for shard, group in self.partition(urls).items():
+            for url, local in self.engines[shard].bulk_create(group).items():
+                ids[url] = local * self.shards + shard
+        return ids
+
+    def create_alias(self, url: str, alias: str, expires_at: Optional[float] = None) -> Optional[int]:
+        shard = self.shard_for_alias(alias)
+        local = self.engines[shard].create_alias(url, alias, expires_at)
+        return None if local is None else local * self.shards + shard
+
+    def get_alias(self, alias: str) -> Optional[int]:
+        shard = self.shard_for_alias(alias)
+        local = self.engines[shard].get_alias(alias)
+        return None if local is None else local * self.shards + shard
+
+    def incr_clicks(self, counts: dict):
+        for shard, items in self._by_shard(counts.items()).items():
+            self.engines[shard].incr_clicks(dict(items))
+
+    def list_page(self, after: Optional[int], limit: int) -> list:
+        # Her shard'dan en fazla limit satır alınır, global id'ye göre birleştirilir
+        rows = []
+        for shard, engine in enumerate(self.engines):
+            local_after = None if after is None else (after - shard - 1) // self.shards + 1
+            if local_after is not None and local_after <= 0:
+                continue
+            rows.extend(
+                (local * self.shards + shard, *rest)
+                for local, *rest in engine.list_page(local_after, limit)
+            )
+        rows.sort(key=lambda row: row[0], reverse=True)
+        return rows[:limit]
+
+    def delete(self, url_id: int) -> bool:
+        engine, local = self._split(url_id)
+        return engine.delete(local)
+
+    def record_clicks(self, events: list, rollups: dict):
+        event_groups = self._by_shard((event[0], event[1:]) for event in events)
+        rollup_groups = {}
+        for period, counts in rollups.items():
+            for (url_id, bucket), n in counts.items():
+                shard_rollups = rollup_groups.setdefault(url_id % self.shards, {})
+                shard_rollups.setdefault(period, {})[(url_id // self.shards, bucket)] = n
+        for shard in set(event_groups) | set(rollup_groups):
+            self.engines[shard].record_clicks(
+                [(local, *rest) for local, rest in event_groups.get(shard, ())],
+                rollup_groups.get(shard, {})
+            )
+
+    def click_series(self, url_id: int, bucket: str, start: int, end: int) -> Optional[list]:
+        engine, local = self._split(url_id)
+        return engine.click_series(local, bucket, start, end)
+
+    def might_exist(self, url_id: int) -> bool:
+        engine, local = self._split(url_id)
+        return engine.might_exist(local)
+
+    def refresh_filter(self):
+        for engine in self.engines:
+            engine.refresh_filter()
+
+    def expired_count(self, now: float) -> int:
+        return sum(engine.expired_count(now) for engine in self.engines)
+
+    def reap_expired(self, now: float, limit: int, shard: Optional[int] = None) -> list:
+        # Shard'lar sırayla boşaltılır; her silme yalnızca kendi dosyasının yazıcı kilidini tutar.
+        # shard verilirse yalnızca o dosyaya dokunulur (o shard'ın yazıcı thread'inden çağrılır)
+        ids = []
+        for index, engine in enumerate(self.engines):
+            if len(ids) >= limit:
+                break
+            if shard is not None and index != shard:
+                continue
+            ids.extend(local * self.shards + index for local in engine.reap_expired(now, limit - len(ids)))
+        return ids
+
+    def stats(self) -> dict:
+        return {
+            "engine": "sqlite-sharded",
+            "shards": [{"path": str(engine.path), **engine.stats()} for engine in self.engines],
+        }
+
+class _Snapshot:
+    """Değişmez id -> URL görüntüsü: dizi tabanlı ofset tablosu + tek parça UTF-8 blob.
+
+    id = base + i olan linkin URL'si blob[offsets[i]:offsets[i + 1]]'dir; boş
+    aralık "yok" demektir (id boşlukları). Süreli linkler ve takma adlar seyrek
+    olduğundan sözlükte tutulur.
+    """
+
+    def __init__(self, base: int, offsets: array, blob: bytes, expires: dict, aliases: dict, links: int = 0):
+        self.base = base
+        self.offsets = offsets
+        self.blob = blob
+        self.expires = expires
+        self.aliases = aliases
+        self.links = links
+
+    @classmethod
+    def load(cls, paths: list) -> "_Snapshot":
+        """Shard dosyalarını salt okunur açar, satırları global id sırasıyla tek geçişte diziye döker"""
+        conns = [sqlite3.connect(f"file:{path}?mode=ro", uri=True) for path in paths]
+        try:
+            shards = len(conns)
+            for conn in conns:
+                # İki sorgu aynı okuma işleminde: urls ve aliases birbiriyle tutarlı
+                conn.execute("BEGIN")
+            cursors = [
+                ((local * shards + shard, url, expires_at) for local, url, expires_at in conn.execute(
+                    "SELECT id, original_url, expires_at FROM urls ORDER BY id"
+                ))
+                for shard, conn in enumerate(conns)
+            ]
+            aliases = {
+                alias: local * shards + shard
+                for shard, conn in enumerate(conns)
+                for alias, local in conn.execute("SELECT alias, url_id FROM aliases")
+            }
+            offsets = array("Q", [0])
+            parts = []
+            expires = {}
+            base = None
+            pos = 0
+            links = 0
+            for url_id, url, expires_at in heapq.merge(*cursors):
+                if base is None:
+                    base = url_id
+                slot = url_id - base
+                gap = slot - (len(offsets) - 1)
+                if gap:
+                    offsets.extend(repeat(pos, gap))
+                data = url.encode()
+                parts.append(data)
+                pos += len(data)
+                offsets.append(pos)
+                links += 1
+                if expires_at is not None:
+                    expires[url_id] = expires_at
+        finally:
+            for conn in conns:
+                conn.close()
+        # 4 GiB'tan küçük blob'larda ofsetler 4 bayta sığar
+        if pos < 2**32:
+            offsets = array("I", offsets)
+        return cls(base or 0, offsets, b"".join(parts), expires, aliases, links)
+
+    def get(self, url_id: int) -> Optional[tuple]:
+        i = url_id - self.base
+        if i < 0 or i >= len(self.offsets) - 1:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        if start == end:
+            return None
+        return self.blob[start:end].decode(), self.expires.get(url_id)
+
+    def nbytes(self) -> int:
+        # Sözlüklerde yalnızca tablo boyutu sayılır; anahtar/değer nesneleri yaklaşık eklenir
+        return (
+            self.offsets.itemsize * len(self.offsets) + len(self.blob)
+            + sys.getsizeof(self.expires) + 32 * len(self.expires)
+            + sys.getsizeof(self.aliases) + 64 * len(self.aliases)
+        )
+
+def _read_only(self, *args):
+    raise RuntimeError("snapshot motoru salt okunurdur")
+
+class SnapshotStorage(_SingleShard):
+    """Yalnızca yönlendirme yapan kopyalar için bellek içi, salt okunur motor.
+
+    Başlangıçta SNAPSHOT_PATH (DB_SHARDS > 1 ise shard dosyaları) okunur;
+    yönlendirmeler SQLite'a hiç uğramaz. reload(), dosyanın (ve varsa -wal
+    dosyasının) inode/mtime/boyut imzası değişince yeni görüntüyü arka planda kurar ve tek bir atamayla
+    değiştirir; o sırada gelen istekler eski görüntüden cevaplanır. Kopyayı
+    yayınlarken dosyayı yerinde yazmak yerine yeni dosyayı rename ile koyun.
+    """
+
+    read_only = True
+    blocking = False
+
+    def __init__(self, path, shards: int = 1):
+        path = Path(path)
+        self.path = path
+        self.paths = [path] if shards == 1 else [
+            path.with_name(f"{path.stem}.{i}{path.suffix}") for i in range(shards)
+        ]
+        self.snapshot = _Snapshot(0, array("I", [0]), b"", {}, {})
+        self.signature = None
+        self.generation = 0
+        self.load_seconds = 0.0
+        self.loaded_at = None
+
+    def _signature(self) -> tuple:
+        # SNAPSHOT_PATH canlı (WAL kipindeki) veritabanı olabilir; yeni linkler checkpoint'e
+        # kadar yalnızca -wal dosyasında durduğundan onun imzası da karşılaştırılır
+        signature = []
+        for path in self.paths:
+            for file in (path, path.with_name(path.name + "-wal")):
+                try:
+                    st = file.stat()
+                except FileNotFoundError:
+                    if file is path:
+                        raise
+                    signature.append(None)
+                    continue
+                signature.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def init(self, profile=None) -> dict:
+        self.reload()
+        return {}
+
+    def reload(self) -> bool:
+        """Dosya değiştiyse yeni görüntüyü yükleyip takas eder; takas olduysa True"""
+        signature = self._signature()
+        if signature == self.signature:
+            return False
+        start = time.perf_counter()
+        snapshot = _Snapshot.load(self.paths)
+        self.load_seconds = time.perf_counter() - start
+        # Okuyucular self.snapshot'ı bir kez alır; atama GIL altında atomiktir
+        self.snapshot = snapshot
+        self.signature = signature
+        self.generation += 1
+        self.loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        logger.info(
+            "Snapshot #%d yüklendi: %d link, %.1f MB (%.1f MB / milyon link), %.2f s",
+            self.generation, snapshot.links, snapshot.nbytes() / 2**20,
+            snapshot.nbytes() / 2**20 / max(snapshot.links, 1) * 1e6, self.load_seconds
+        )
+        return True
+
+    def close(self):
+        pass
+
+    def get_by_id(self, url_id: int) -> Optional[tuple]:
+        return self.snapshot.get(url_id)
+
+    def get_alias(self, alias: str) -> Optional[int]:
+        return self.snapshot.aliases.get(alias)
+
+    def might_exist(self, url_id: int) -> bool:
+        # Görüntü kesin cevap verir; ayrı bir filtreye gerek yok
+        return self.snapshot.get(url_id) is not None
+
+    def refresh_filter(self):
+        pass
+
+    # Tıklamalar kenar kopyalarda sayılmaz; tamponlar birikmesin diye sessizce atılır
+    def incr_clicks(self, counts: dict):
+        pass
+
+    def record_clicks(self, events: list, rollups: dict):
+        pass
+
+    # Süresi dolan linkler 410 döner, silme birincil sunucunun reaper'ının işidir
+    def expired_count(self, now: float) -> int:
+        return 0
+
+    def reap_expired(self, now: float, limit: int, shard: Optional[int] = None) -> list:
+        return []
+
+    get_or_create = bulk_create = create_alias = delete = list_page = click_series = _read_only
+
+    def stats(self) -> dict:
+        snapshot = self.snapshot
+        nbytes = snapshot.nbytes()
+        return {
+            "engine": "snapshot",
+            "paths": [str(path) for path in self.paths],
+            "generation": self.generation,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 3),
+            "links": snapshot.links,
+            "aliases": len(snapshot.aliases),
+            "bytes": nbytes,
+            "bytes_per_million_links": round(nbytes / snapshot.links * 1e6) if snapshot.links else 0,
+        }
+
+def _sqlite_engine():
+    return ShardedStorage(DB_PATH, DB_SHARDS) if DB_SHARDS > 1 else SQLiteStorage(DB_PATH)
+
+STORAGE_ENGINES = {
+    "sqlite": _sqlite_engine,
+    "memory": MemoryStorage,
+    "snapshot": lambda: SnapshotStorage(SNAPSHOT_PATH, DB_SHARDS),
+}
+
+def create_storage(name: str = STORAGE_BACKEND) -> Storage:
+    try:
+        return STORAGE_ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Bilinmeyen STORAGE_BACKEND: {name}") from None
+
+storage = create_storage()
+
+def init_db(profile=None):
+    return storage.init(profile)
+
+class BackgroundWriter(ABC):
+    """Birikmiş işi belirli aralıklarla (ya da wake() ile erkenden) yazan arka plan thread'i"""
+
+    name = "background-writer"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @abstractmethod
+    def flush(self) -> int:
+        """Birikmiş işi yazar, yazılan öğe sayısını döndürür"""
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s yazamadı", self.name)
+
+def _group_by_shard(items) -> dict:
+    """(id, değer) çiftlerini id'nin shard'ına göre gruplar"""
+    groups = {}
+    for item in items:
+        groups.setdefault(storage.shard_for_id(item[0]), []).append(item)
+    return groups
 
-# ============ Yardımcı Fonksiyonlar ============
-def base62(n: int) -> str:
-    if n == 0:
-        return ALPHABET[0]
-    s = []
-    b = len(ALPHABET)
-    while n > 0:
-        n, r = divmod(n, b)
-        s.append(ALPHABET[r])
-    return "".join(reversed(s))
+class ClickBuffer(BackgroundWriter):
+    """Tıklama artışlarını bellekte toplar, arka planda toplu halde yazar"""
 
-def base62_decode(code: str) -> int:
-    b = len(ALPHABET)
-    n = 0
-    for c in code:
-        n = n * b + ALPHABET.index(c)
-    return n
+    name = "click-flusher"
 
-def get_conn():
-    return sqlite3.connect(DB_PATH)
-
-def init_db():
-    with get_conn() as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS urls (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                original_url TEXT NOT NULL,
-                created_at TIMESTAMP NOT NULL,
-                clicks INTEGER DEFAULT 0
-            )
-        """)
-        conn.execute("""
-            CREATE UNIQUE INDEX IF NOT EXISTS idx_original_url ON urls(original_url)
-        """)
+    def __init__(self, interval: float, threshold: int):
+        super().__init__(interval)
+        self.threshold = threshold
+        self._pending = {}
+        self._total = 0
+        self._lock = threading.Lock()
 
-def generate_qr(data: str) -> str:
-    """QR kod oluştur (base64 PNG döndürür)"""
+    def add(self, url_id: int):
+        with self._lock:
+            self._pending[url_id] = self._pending.get(url_id, 0) + 1
+            self._total += 1
+            full = self._total >= self.threshold
+        if full:
+            self._wake.set()
+
+    def pending(self, url_id: int) -> int:
+        with self._lock:
+            return self._pending.get(url_id, 0)
+
+    def discard(self, url_id: int):
+        with self._lock:
+            self._total -= self._pending.pop(url_id, 0)
+
+    def flush(self) -> int:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._total = 0
+        if not batch:
+            return 0
+        groups = list(_group_by_shard(batch.items()).items())
+        for i, (shard, items) in enumerate(groups):
+            try:
+                db.write_blocking(storage.incr_clicks, dict(items), shard=shard)
+            except Exception:
+                # Yazılamayan tıklamaları kaybetme, bir sonraki turda tekrar dene
+                with self._lock:
+                    for _, rest in groups[i:]:
+                        for url_id, n in rest:
+                            self._pending[url_id] = self._pending.get(url_id, 0) + n
+                            self._total += n
+                raise
+        return len(batch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pending_clicks": self._total, "pending_ids": len(self._pending)}
+
+click_buffer = ClickBuffer(CLICK_FLUSH_INTERVAL, CLICK_FLUSH_THRESHOLD)
+
+_BOT_MARKERS = ("bot", "crawl", "spider", "slurp", "curl", "wget", "python", "httpx", "go-http", "java/")
+_MOBILE_MARKERS = ("mobile", "android", "iphone", "ipad", "ipod")
+
+def classify_user_agent(ua: str) -> str:
+    """User-Agent'ı bot/mobile/desktop/unknown sınıfına indirger"""
+    if not ua:
+        return "unknown"
+    ua = ua.lower()
+    if any(m in ua for m in _BOT_MARKERS):
+        return "bot"
+    if any(m in ua for m in _MOBILE_MARKERS):
+        return "mobile"
+    return "desktop"
+
+class ClickEventLog(BackgroundWriter):
+    """Tıklama olaylarını halka tamponda toplar; ham tabloya ve özetlere toplu yazar"""
+
+    name = "click-events"
+
+    def __init__(self, interval: float, capacity: int):
+        super().__init__(interval)
+        # deque.append thread-safe'tir; dolunca en eski olay düşer
+        self._events = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.dropped = 0
+        self.written = 0
+
+    def record(self, url_id: int, referrer: Optional[str], user_agent: Optional[str]):
+        if len(self._events) == self.capacity:
+            self.dropped += 1
+        self._events.append((url_id, time.time(), referrer, user_agent))
+
+    def flush(self) -> int:
+        events = []
+        try:
+            while True:
+                events.append(self._events.popleft())
+        except IndexError:
+            pass
+        if not events:
+            return 0
+        # Sınıflandırma ve toplama istek yolunda değil, burada yapılır
+        ua_classes = {}
+        groups = list(_group_by_shard(events).items())
+        written = 0
+        for i, (shard, shard_events) in enumerate(groups):
+            rows = []
+            rollups = {period: Counter() for period in ROLLUP_TABLES}
+            for url_id, ts, referrer, ua in shard_events:
+                ua_class = ua_classes.get(ua)
+                if ua_class is None:
+                    ua_class = ua_classes[ua] = classify_user_agent(ua)
+                referrer_host = (urlsplit(referrer).netloc or None) if referrer else None
+                rows.append((url_id, ts, referrer_host, ua_class))
+                for period, width in BUCKET_SECONDS.items():
+                    rollups[period][(url_id, int(ts) // width * width)] += 1
+            try:
+                # Her shard'ın satırları o shard'ın yazıcı thread'inde yazılır
+                db.write_blocking(storage.record_clicks, rows, rollups, shard=shard)
+            except Exception:
+                self.written += written
+                self._requeue([event for _, rest in groups[i:] for event in rest])
+                raise
+            written += len(shard_events)
+        self.written += written
+        return written
+
+    def _requeue(self, events: list):
+        """Yazılamayan olayları sıranın başına geri koyar; sığmayan en eskiler düşer"""
+        room = self.capacity - len(self._events)
+        if room < len(events):
+            self.dropped += len(events) - max(room, 0)
+            events = events[len(events) - max(room, 0):]
+        self._events.extendleft(reversed(events))
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._events),
+            "capacity": self.capacity,
+            "dropped": self.dropped,
+            "written": self.written,
+        }
+
+click_events = ClickEventLog(CLICK_FLUSH_INTERVAL, CLICK_EVENT_BUFFER)
+
+class FilterRefresher(BackgroundWriter):
+    """Negatif filtreyi diğer worker'ların yazdıklarıyla periyodik olarak eşitler"""
+
+    name = "id-filter"
+
+    def flush(self) -> int:
+        storage.refresh_filter()
+        return 0
+
+filter_refresher = FilterRefresher(NEGATIVE_FILTER_REFRESH)
+
+class LinkReaper(BackgroundWriter):
+    """Süresi dolmuş linkleri küçük partiler halinde siler; her parti ayrı, kısa bir işlemdir"""
+
+    name = "link-reaper"
+
+    def __init__(self, interval: float, batch: int):
+        super().__init__(interval)
+        self.batch = batch
+
+    def flush(self) -> int:
+        now = time.time()
+        backlog = storage.expired_count(now)
+        expired_backlog.set(backlog)
+        reaped = 0
+        for shard in range(storage.shards):
+            while backlog > reaped:
+                start = time.perf_counter()
+                ids = db.write_blocking(storage.reap_expired, now, self.batch, shard, shard=shard)
+                reap_batch_latency.observe(time.perf_counter() - start)
+                for url_id in ids:
+                    redirect_cache.invalidate(url_id)
+                    click_buffer.discard(url_id)
+                reaped += len(ids)
+                links_reaped.inc(amount=len(ids))
+                expired_backlog.set(max(0, backlog - reaped))
+                if len(ids) < self.batch:
+                    break
+            # Kapanışta uzun bir birikim beklenmez, kalanı bir sonraki açılışta silinir
+            if self._stop.is_set():
+                break
+        return reaped
+
+link_reaper = LinkReaper(REAPER_INTERVAL, REAPER_BATCH)
+
+class SnapshotReloader(BackgroundWriter):
+    """Snapshot dosyası değiştiğinde yenisini yükler; eski görüntüden kalan önbellek girdilerini atar"""
+
+    name = "snapshot-reloader"
+
+    def flush(self) -> int:
+        if not storage.reload():
+            return 0
+        redirect_cache.clear()
+        alias_cache.clear()
+        return 1
+
+snapshot_reloader = SnapshotReloader(SNAPSHOT_RELOAD)
+
+def _timed_call(fn, *args):
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        db_latency.observe(time.perf_counter() - start, fn.__name__)
+
+class DBExecutor:
+    """DB işlerini kuyruk üzerinden shard başına tek yazıcı ve N okuyucu thread'e dağıtır"""
+
+    def __init__(self, mode: str, readers: int, writers: int = 1):
+        if mode not in ("dedicated", "threadpool"):
+            raise ValueError(f"Bilinmeyen DB_EXECUTOR: {mode}")
+        self.mode = mode
+        self.readers = readers
+        self.writers = writers
+        self._reader = None
+        self._writers = []
+
+    def start(self):
+        if self.mode != "dedicated" or self._writers:
+            return
+        # Bir shard'ın yazmaları tek thread'de sıralanır, SQLite yazıcı kilidi için yarışılmaz
+        self._writers = [
+            ThreadPoolExecutor(1, thread_name_prefix=f"db-writer-{i}") for i in range(self.writers)
+        ]
+        self._reader = ThreadPoolExecutor(self.readers, thread_name_prefix="db-reader")
+
+    def stop(self):
+        for executor in (*self._writers, self._reader):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._writers = []
+        self._reader = None
+
+    async def _run(self, executor, fn, *args):
+        with profile_phase("db"):
+            if executor is None:
+                return await run_in_threadpool(_timed_call, fn, *args)
+            return await asyncio.get_running_loop().run_in_executor(executor, _timed_call, fn, *args)
+
+    async def read(self, fn, *args):
+        return await self._run(self._reader, fn, *args)
+
+    async def write(self, fn, *args, shard: int = 0):
+        writer = self._writers[shard % len(self._writers)] if self._writers else None
+        return await self._run(writer, fn, *args)
+
+    def write_blocking(self, fn, *args, shard: int = 0):
+        """Arka plan thread'lerinin yazmaları: shard'ın yazıcısına sıraya girip sonucu bekler"""
+        writers = self._writers
+        if not writers:
+            return _timed_call(fn, *args)
+        return writers[shard % len(writers)].submit(_timed_call, fn, *args).result()
+
+db = DBExecutor(DB_EXECUTOR, DB_READERS, storage.shards)
+
+# (short_url, format) -> (bytes, etag) önbelleği
+qr_cache = LRUCache(QR_CACHE_SIZE)
+
+QR_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+def _draw_qr(data: str, fmt: str):
     try:
         import qrcode
-        qr = qrcode.QRCode(version=1, box_size=10, border=2)
-        qr.add_data(data)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        buf.seek(0)
-        return base64.b64encode(buf.read()).decode()
+        import qrcode.image.svg
     except ImportError:
+        return None
+    start = time.perf_counter()
+    qr = qrcode.QRCode(version=1, box_size=10, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    buf = io.BytesIO()
+    if fmt == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buf)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buf, format="PNG")
+    body = buf.getvalue()
+    qr_render.observe(time.perf_counter() - start, fmt)
+    return body, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def render_qr(data: str, fmt: str = "png"):
+    """QR kodu PNG/SVG olarak üretir, (bytes, etag) döndürür; qrcode yoksa None"""
+    rendered = qr_cache.get((data, fmt))
+    if rendered is None:
+        rendered = _draw_qr(data, fmt)
+        if rendered is not None:
+            qr_cache.set((data, fmt), rendered)
+    return rendered
+
+def generate_qr(data: str) -> str:
+    """QR kod oluştur (base64 PNG döndürür)"""
+    rendered = render_qr(data, "png")
+    if rendered is None:
         return ""
+    return base64.b64encode(rendered[0]).decode()
 
 @app.on_event("startup")
 def startup():
-    init_db()
+    storage.init()
+    db.start()
+    click_buffer.start()
+    click_events.start()
+    link_reaper.start()
+    if NEGATIVE_FILTER:
+        filter_refresher.start()
+    if STORAGE_BACKEND == "snapshot":
+        snapshot_reloader.start()
+
+@app.on_event("shutdown")
+def shutdown():
+    # Arka plan yazıcılarının son flush'ı hâlâ yazıcı thread'lerinden geçer
+    click_buffer.stop()
+    click_events.stop()
+    link_reaper.stop()
+    if NEGATIVE_FILTER:
+        filter_refresher.stop()
+    if STORAGE_BACKEND == "snapshot":
+        snapshot_reloader.stop()
+    db.stop()
+    storage.close()
 
 # ============ Modeller ============
 class ShortenIn(BaseModel):
     url: HttpUrl
+    # base64 QR yalnızca istenirse yanıta eklenir; varsayılan qr_url kullanmaktır
+    include_qr: bool = False
+    # Bitiş zamanı ya da saniye cinsinden ömür; ikisi de yoksa link kalıcıdır
+    expires_at: Optional[datetime] = None
+    ttl: Optional[int] = Field(None, gt=0)
+    # Özel kısa kod (ör. "yaz-indirimi"); verilmezse encode_id(id) kullanılır
+    alias: Optional[str] = Field(None, pattern=f"^{ALIAS_PATTERN}$")
 
 class ShortenOut(BaseModel):
     code: str
     short_url: str
     long_url: str
+    qr_url: str = ""
     qr_code: str = ""
+    expires_at: Optional[str] = None
 
 class URLDetail(BaseModel):
     id: int
@@ -83,494 +2511,18 @@ class URLDetail(BaseModel):
     original_url: str
     created_at: str
     clicks: int
+    expires_at: Optional[str] = None
+    alias: Optional[str] = None
 
 # ============ Ana Sayfa (Web UI) ============
-@app.get("/", response_class=HTMLResponse)
-def home():
-    return """
+HOME_TEMPLATE = """
 <!doctype html>
 <html lang="tr">
 <head>
   <meta charset="utf-8"/>
   <meta name="viewport" content="width=device-width, initial-scale=1"/>
   <title>✨ URL Kısaltıcı Pro</title>
-  <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;900&display=swap');
-    
-    :root {
-      --gradient-1: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-      --gradient-2: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-      --gradient-3: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-      --gradient-hero: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-      --shadow-sm: 0 2px 8px rgba(0,0,0,.08);
-      --shadow-md: 0 8px 30px rgba(0,0,0,.12);
-      --shadow-lg: 0 20px 60px rgba(0,0,0,.3);
-      --bg: #f8f9fe;
-      --fg: #1a202c;
-      --muted: #64748b;
-      --card-bg: rgba(255,255,255,.85);
-      --input-bg: #fff;
-      --border: rgba(0,0,0,.08);
-      --success: #10b981;
-      --danger: #ef4444;
-    }
-    
-    [data-theme="dark"] {
-      --gradient-hero: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-      --bg: #0f172a;
-      --fg: #f1f5f9;
-      --muted: #94a3b8;
-      --card-bg: rgba(30,41,59,.85);
-      --input-bg: #1e293b;
-      --border: rgba(255,255,255,.1);
-    }
-    
-    * { box-sizing: border-box; margin: 0; padding: 0; }
-    
-    body {
-      font-family: 'Inter', system-ui, -apple-system, sans-serif;
-      background: var(--bg);
-      color: var(--fg);
-      min-height: 100vh;
-      overflow-x: hidden;
-      position: relative;
-    }
-    
-    /* Animated gradient background */
-    body::before {
-      content: '';
-      position: fixed;
-      top: -50%;
-      left: -50%;
-      width: 200%;
-      height: 200%;
-      background: var(--gradient-hero);
-      opacity: .15;
-      animation: gradient-shift 15s ease infinite;
-      z-index: -1;
-    }
-    
-    @keyframes gradient-shift {
-      0%, 100% { transform: translate(0, 0) rotate(0deg); }
-      33% { transform: translate(5%, 5%) rotate(120deg); }
-      66% { transform: translate(-5%, 5%) rotate(240deg); }
-    }
-    
-    /* Floating particles */
-    .particles { position: fixed; width: 100%; height: 100%; top: 0; left: 0; z-index: -1; pointer-events: none; }
-    .particle {
-      position: absolute;
-      width: 3px;
-      height: 3px;
-      background: var(--gradient-3);
-      border-radius: 50%;
-      opacity: .4;
-      animation: float 20s infinite ease-in-out;
-    }
-    
-    @keyframes float {
-      0%, 100% { transform: translate(0, 0) scale(1); }
-      25% { transform: translate(100px, -100px) scale(1.2); }
-      50% { transform: translate(-50px, -200px) scale(.8); }
-      75% { transform: translate(150px, -150px) scale(1.1); }
-    }
-    
-    .container {
-      max-width: 1100px;
-      margin: 0 auto;
-      padding: 40px 24px;
-      position: relative;
-      z-index: 1;
-    }
-    
-    /* Header with gradient text */
-    .hero {
-      text-align: center;
-      margin-bottom: 48px;
-      animation: fade-in-up .8s ease;
-    }
-    
-    @keyframes fade-in-up {
-      from { opacity: 0; transform: translateY(30px); }
-      to { opacity: 1; transform: translateY(0); }
-    }
-    
-    h1 {
-      font-size: clamp(32px, 5vw, 56px);
-      font-weight: 900;
-      background: var(--gradient-hero);
-      -webkit-background-clip: text;
-      -webkit-text-fill-color: transparent;
-      background-clip: text;
-      margin-bottom: 12px;
-      letter-spacing: -0.02em;
-    }
-    
-    .subtitle {
-      color: var(--muted);
-      font-size: 18px;
-      font-weight: 500;
-    }
-    
-    /* Glassmorphism cards */
-    .card {
-      background: var(--card-bg);
-      backdrop-filter: blur(20px);
-      border: 1px solid var(--border);
-      border-radius: 24px;
-      padding: 32px;
-      margin: 24px 0;
-      box-shadow: var(--shadow-md);
-      transition: all .3s cubic-bezier(.4,0,.2,1);
-      animation: fade-in-up .8s ease;
-      animation-fill-mode: backwards;
-    }
-    
-    .card:nth-child(2) { animation-delay: .1s; }
-    .card:nth-child(3) { animation-delay: .2s; }
-    
-    .card:hover {
-      transform: translateY(-4px);
-      box-shadow: var(--shadow-lg);
-    }
-    
-    /* Input styling */
-    .input-group {
-      display: flex;
-      gap: 12px;
-      margin-bottom: 24px;
-    }
-    
-    input {
-      flex: 1;
-      font-family: inherit;
-      font-size: 16px;
-      padding: 16px 20px;
-      border: 2px solid var(--border);
-      border-radius: 16px;
-      background: var(--input-bg);
-      color: var(--fg);
-      outline: none;
-      transition: all .3s ease;
-    }
-    
-    input:focus {
-      border-color: #667eea;
-      box-shadow: 0 0 0 4px rgba(102,126,234,.1);
-    }
-    
-    input::placeholder { color: var(--muted); }
-    
-    /* Gradient buttons */
-    button {
-      font-family: inherit;
-      font-size: 16px;
-      font-weight: 600;
-      padding: 16px 32px;
-      border: 0;
-      border-radius: 16px;
-      background: var(--gradient-1);
-      color: #fff;
-      cursor: pointer;
-      transition: all .3s ease;
-      box-shadow: var(--shadow-sm);
-      position: relative;
-      overflow: hidden;
-    }
-    
-    button::before {
-      content: '';
-      position: absolute;
-      top: 0;
-      left: -100%;
-      width: 100%;
-      height: 100%;
-      background: linear-gradient(90deg, transparent, rgba(255,255,255,.3), transparent);
-      transition: left .5s;
-    }
-    
-    button:hover::before { left: 100%; }
-    button:hover { transform: translateY(-2px); box-shadow: var(--shadow-md); }
-    button:active { transform: scale(.98); }
-    
-    .btn-danger {
-      background: var(--gradient-2);
-      padding: 8px 16px;
-      font-size: 14px;
-    }
-    
-    .btn-secondary {
-      background: var(--gradient-3);
-      padding: 12px 24px;
-    }
-    
-    /* Result card */
-    .result {
-      margin-top: 24px;
-      padding: 20px;
-      background: linear-gradient(135deg, rgba(102,126,234,.1), rgba(246,173,85,.1));
-      border-radius: 16px;
-      border: 2px dashed var(--border);
-      animation: slide-in .4s ease;
-    }
-    
-    @keyframes slide-in {
-      from { opacity: 0; transform: translateY(-10px); }
-      to { opacity: 1; transform: translateY(0); }
-    }
-    
-    .result-url {
-      display: flex;
-      align-items: center;
-      gap: 12px;
-      margin-bottom: 16px;
-      flex-wrap: wrap;
-    }
-    
-    .result-url strong { color: var(--fg); font-size: 14px; }
-    .result-url a {
-      color: #667eea;
-      text-decoration: none;
-      font-weight: 600;
-      word-break: break-all;
-      position: relative;
-    }
-    
-    .result-url a::after {
-      content: '';
-      position: absolute;
-      bottom: -2px;
-      left: 0;
-      width: 0;
-      height: 2px;
-      background: #667eea;
-      transition: width .3s ease;
-    }
-    
-    .result-url a:hover::after { width: 100%; }
-    
-    .qr-container {
-      display: inline-block;
-      padding: 12px;
-      background: #fff;
-      border-radius: 12px;
-      box-shadow: var(--shadow-sm);
-    }
-    
-    .qr { max-width: 180px; display: block; border-radius: 8px; }
-    
-    /* URL list */
-    .list-header {
-      display: flex;
-      justify-content: space-between;
-      align-items: center;
-      margin-bottom: 20px;
-    }
-    
-    .list-header h2 {
-      font-size: 24px;
-      font-weight: 700;
-    }
-    
-    .url-item {
-      display: flex;
-      justify-content: space-between;
-      align-items: center;
-      padding: 20px;
-      margin-bottom: 12px;
-      background: rgba(102,126,234,.05);
-      border-radius: 16px;
-      border: 1px solid var(--border);
-      transition: all .3s ease;
-      animation: fade-in .3s ease;
-    }
-    
-    @keyframes fade-in {
-      from { opacity: 0; }
-      to { opacity: 1; }
-    }
-    
-    .url-item:hover {
-      background: rgba(102,126,234,.1);
-      transform: translateX(4px);
-    }
-    
-    .url-info { flex: 1; }
-    .url-code {
-      display: inline-block;
-      padding: 4px 12px;
-      background: var(--gradient-1);
-      color: #fff;
-      border-radius: 8px;
-      font-weight: 600;
-      font-size: 14px;
-      margin-right: 12px;
-    }
-    
-    .url-link {
-      color: var(--fg);
-      text-decoration: none;
-      font-weight: 500;
-    }
-    
-    .url-link:hover { color: #667eea; }
-    
-    .url-meta {
-      color: var(--muted);
-      font-size: 14px;
-      margin-top: 8px;
-      display: flex;
-      gap: 16px;
-    }
-    
-    .url-actions {
-      display: flex;
-      gap: 8px;
-    }
-    
-    /* Theme toggle */
-    .theme-toggle {
-      position: fixed;
-      top: 24px;
-      right: 24px;
-      width: 56px;
-      height: 56px;
-      border-radius: 50%;
-      background: var(--card-bg);
-      backdrop-filter: blur(10px);
-      border: 1px solid var(--border);
-      box-shadow: var(--shadow-md);
-      cursor: pointer;
-      z-index: 1000;
-      font-size: 24px;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      transition: all .3s ease;
-    }
-    
-    .theme-toggle:hover {
-      transform: rotate(180deg) scale(1.1);
-    }
-    
-    /* Language selector */
-    .lang-selector {
-      position: fixed;
-      top: 24px;
-      left: 24px;
-      display: flex;
-      gap: 8px;
-      z-index: 1000;
-    }
-    
-    .lang-btn {
-      padding: 10px 16px;
-      border-radius: 12px;
-      background: var(--card-bg);
-      backdrop-filter: blur(10px);
-      border: 2px solid var(--border);
-      color: var(--fg);
-      font-size: 14px;
-      font-weight: 600;
-      cursor: pointer;
-      transition: all .3s ease;
-      box-shadow: var(--shadow-sm);
-    }
-    
-    .lang-btn:hover {
-      transform: translateY(-2px);
-      box-shadow: var(--shadow-md);
-      border-color: #667eea;
-    }
-    
-    .lang-btn.active {
-      background: var(--gradient-1);
-      color: #fff;
-      border-color: transparent;
-    }
-    
-    /* Loading spinner */
-    .spinner {
-      display: inline-block;
-      width: 20px;
-      height: 20px;
-      border: 3px solid rgba(102,126,234,.3);
-      border-top-color: #667eea;
-      border-radius: 50%;
-      animation: spin 1s linear infinite;
-    }
-    
-    @keyframes spin {
-      to { transform: rotate(360deg); }
-    }
-    
-    /* Copy button */
-    .copy-btn {
-      padding: 8px 16px;
-      font-size: 14px;
-      background: var(--gradient-3);
-    }
-    
-    /* Stats badge */
-    .stats-badge {
-      display: inline-flex;
-      align-items: center;
-      gap: 6px;
-      padding: 4px 10px;
-      background: rgba(16,185,129,.15);
-      color: var(--success);
-      border-radius: 8px;
-      font-size: 13px;
-      font-weight: 600;
-    }
-    
-    /* Empty state */
-    .empty-state {
-      text-align: center;
-      padding: 60px 20px;
-      color: var(--muted);
-    }
-    
-    .empty-state svg {
-      width: 120px;
-      height: 120px;
-      margin-bottom: 20px;
-      opacity: .5;
-    }
-    
-    /* Responsive */
-    @media (max-width: 768px) {
-      .container { padding: 20px 16px; }
-      .hero h1 { font-size: 32px; }
-      .input-group { flex-direction: column; }
-      button { width: 100%; }
-      .url-item { flex-direction: column; align-items: flex-start; gap: 12px; }
-      .url-actions { width: 100%; justify-content: stretch; }
-      .url-actions button { flex: 1; }
-      
-      .lang-selector {
-        top: auto;
-        bottom: 24px;
-        left: 50%;
-        transform: translateX(-50%);
-        background: var(--card-bg);
-        backdrop-filter: blur(10px);
-        padding: 8px;
-        border-radius: 16px;
-        box-shadow: var(--shadow-lg);
-      }
-      
-      .theme-toggle {
-        top: auto;
-        bottom: 24px;
-        right: 24px;
-      }
-      
-      .card { padding: 20px; }
-      .list-header { flex-direction: column; align-items: flex-start; gap: 12px; }
-      .list-header button { width: 100%; }
-    }
-  </style>
+  <link rel="stylesheet" href="{css}"/>
 </head>
 <body>
   <div class="particles" id="particles"></div>
@@ -614,477 +2566,468 @@ def home():
     </div>
   </div>
 
-  <script>
-    // Translations
-    const translations = {
-      en: {
-        title: '✨ URL Shortener Pro',
-        subtitle: 'Shorten long links instantly • Generate QR codes • Track statistics',
-        inputPlaceholder: 'https://example.com/very-long-url-here...',
-        shortenBtn: '🚀 Shorten',
-        allUrls: '📊 All URLs',
-        refreshBtn: '🔄 Refresh',
-        processing: 'Processing...',
-        pleaseEnterUrl: '❌ Please enter a URL',
-        error: 'Error',
-        shortUrl: 'Short URL:',
-        copy: '📋 Copy',
-        copied: '✅ Copied!',
-        delete: '🗑️',
-        clicks: 'clicks',
-        noUrls: 'No shortened URLs yet.',
-        startMessage: 'Add a URL from above to get started! 🚀',
-        deleteConfirm: 'Are you sure you want to delete this URL?',
-        deleteError: '❌ Could not delete',
-        copyError: '❌ Could not copy'
-      },
-      tr: {
-        title: '✨ URL Kısaltıcı Pro',
-        subtitle: 'Uzun linkleri anında kısalt • QR kod üret • İstatistik tut',
-        inputPlaceholder: 'https://ornek.com/cok-uzun-bir-url-buraya...',
-        shortenBtn: '🚀 Kısalt',
-        allUrls: '📊 Tüm URLler',
-        refreshBtn: '🔄 Yenile',
-        processing: 'İşleniyor...',
-        pleaseEnterUrl: '❌ Lütfen bir URL girin',
-        error: 'Hata',
-        shortUrl: 'Kısa URL:',
-        copy: '📋 Kopyala',
-        copied: '✅ Kopyalandı!',
-        delete: '🗑️',
-        clicks: 'tıklama',
-        noUrls: 'Henüz kısaltılmış URL yok.',
-        startMessage: 'Yukarıdan bir URL ekleyerek başlayın! 🚀',
-        deleteConfirm: 'Bu URLi silmek istediğinizden emin misiniz?',
-        deleteError: '❌ Silinemedi',
-        copyError: '❌ Kopyalanamadı'
-      },
-      de: {
-        title: '✨ URL-Kürzer Pro',
-        subtitle: 'Lange Links sofort kürzen • QR-Codes generieren • Statistiken verfolgen',
-        inputPlaceholder: 'https://beispiel.com/sehr-lange-url-hier...',
-        shortenBtn: '🚀 Kürzen',
-        allUrls: '📊 Alle URLs',
-        refreshBtn: '🔄 Aktualisieren',
-        processing: 'Wird verarbeitet...',
-        pleaseEnterUrl: '❌ Bitte geben Sie eine URL ein',
-        error: 'Fehler',
-        shortUrl: 'Kurz-URL:',
-        copy: '📋 Kopieren',
-        copied: '✅ Kopiert!',
-        delete: '🗑️',
-        clicks: 'Klicks',
-        noUrls: 'Noch keine gekürzten URLs.',
-        startMessage: 'Fügen Sie oben eine URL hinzu, um zu beginnen! 🚀',
-        deleteConfirm: 'Sind Sie sicher, dass Sie diese URL löschen möchten?',
-        deleteError: '❌ Konnte nicht gelöscht werden',
-        copyError: '❌ Konnte nicht kopiert werden'
-      }
-    };
-    
-    // Language management
-    let currentLang = localStorage.getItem('lang') || 'en';
-    
-    function changeLang(lang) {
-      currentLang = lang;
-      localStorage.setItem('lang', lang);
-      updateLanguage();
-      playSound('click');
-    }
-    
-    function updateLanguage() {
-      const t = translations[currentLang];
-      
-      // Update all elements with data-i18n attribute
-      document.querySelectorAll('[data-i18n]').forEach(el => {
-        const key = el.getAttribute('data-i18n');
-        if (t[key]) el.textContent = t[key];
-      });
-      
-      // Update placeholder
-      const input = document.getElementById('url');
-      if (input) input.placeholder = t.inputPlaceholder;
-      
-      // Update active language button
-      document.querySelectorAll('.lang-btn').forEach(btn => {
-        btn.classList.toggle('active', btn.getAttribute('data-lang') === currentLang);
-      });
-      
-      // Reload list to update translations
-      if (document.getElementById('list').children.length > 0) {
-        loadAll();
-      }
-    }
-    
-    // Theme management
-    let theme = localStorage.getItem('theme') || 'light';
-    document.documentElement.dataset.theme = theme;
-    updateThemeIcon();
-    
-    function toggleTheme() {
-      theme = theme === 'dark' ? 'light' : 'dark';
-      document.documentElement.dataset.theme = theme;
-      localStorage.setItem('theme', theme);
-      updateThemeIcon();
-      playSound('click');
-    }
-    
-    function updateThemeIcon() {
-      document.getElementById('theme-icon').textContent = theme === 'dark' ? '☀️' : '🌙';
-    }
-    
-    // Initialize language on load
-    updateLanguage();
-    
-    // Generate floating particles
-    function createParticles() {
-      const container = document.getElementById('particles');
-      for (let i = 0; i < 15; i++) {
-        const particle = document.createElement('div');
-        particle.className = 'particle';
-        particle.style.left = Math.random() * 100 + '%';
-        particle.style.top = Math.random() * 100 + '%';
-        particle.style.animationDelay = Math.random() * 20 + 's';
-        particle.style.animationDuration = (15 + Math.random() * 10) + 's';
-        container.appendChild(particle);
-      }
-    }
-    createParticles();
-    
-    // Sound Effects System
-    let audioContext;
-    try {
-      audioContext = new (window.AudioContext || window.webkitAudioContext)();
-    } catch(e) {
-      console.warn('Audio not supported:', e);
-    }
-    
-    function playSound(type) {
-      if (!audioContext) return;
-      
-      try {
-        const oscillator = audioContext.createOscillator();
-        const gainNode = audioContext.createGain();
-      
-      oscillator.connect(gainNode);
-      gainNode.connect(audioContext.destination);
-      
-      switch(type) {
-        case 'success':
-          // Başarı sesi - yükselen notalar
-          oscillator.frequency.setValueAtTime(523.25, audioContext.currentTime); // C5
-          oscillator.frequency.setValueAtTime(659.25, audioContext.currentTime + 0.1); // E5
-          oscillator.frequency.setValueAtTime(783.99, audioContext.currentTime + 0.2); // G5
-          gainNode.gain.setValueAtTime(0.3, audioContext.currentTime);
-          gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.4);
-          oscillator.start(audioContext.currentTime);
-          oscillator.stop(audioContext.currentTime + 0.4);
-          break;
-          
-        case 'copy':
-          // Kopyalama sesi - kısa bip
-          oscillator.frequency.setValueAtTime(800, audioContext.currentTime);
-          oscillator.type = 'sine';
-          gainNode.gain.setValueAtTime(0.2, audioContext.currentTime);
-          gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.15);
-          oscillator.start(audioContext.currentTime);
-          oscillator.stop(audioContext.currentTime + 0.15);
-          break;
-          
-        case 'delete':
-          // Silme sesi - düşen notalar
-          oscillator.frequency.setValueAtTime(600, audioContext.currentTime);
-          oscillator.frequency.exponentialRampToValueAtTime(200, audioContext.currentTime + 0.3);
-          oscillator.type = 'sawtooth';
-          gainNode.gain.setValueAtTime(0.15, audioContext.currentTime);
-          gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.3);
-          oscillator.start(audioContext.currentTime);
-          oscillator.stop(audioContext.currentTime + 0.3);
-          break;
-          
-        case 'error':
-          // Hata sesi - düşük titreşim
-          oscillator.frequency.setValueAtTime(150, audioContext.currentTime);
-          oscillator.type = 'sawtooth';
-          gainNode.gain.setValueAtTime(0.2, audioContext.currentTime);
-          gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.4);
-          oscillator.start(audioContext.currentTime);
-          oscillator.stop(audioContext.currentTime + 0.4);
-          break;
-          
-        case 'click':
-          // Tıklama sesi - kısa patlama
-          oscillator.frequency.setValueAtTime(400, audioContext.currentTime);
-          oscillator.type = 'square';
-          gainNode.gain.setValueAtTime(0.1, audioContext.currentTime);
-          gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.05);
-          oscillator.start(audioContext.currentTime);
-          oscillator.stop(audioContext.currentTime + 0.05);
-          break;
-      }
-      } catch(e) {
-        console.warn('Sound error:', e);
-      }
-    }
-    
-    // Confetti effect for success
-    function createConfetti() {
-      const colors = ['#667eea', '#764ba2', '#f093fb', '#f5576c', '#4facfe', '#00f2fe'];
-      const confettiCount = 50;
-      
-      for (let i = 0; i < confettiCount; i++) {
-        const confetti = document.createElement('div');
-        confetti.style.position = 'fixed';
-        confetti.style.width = '10px';
-        confetti.style.height = '10px';
-        confetti.style.backgroundColor = colors[Math.floor(Math.random() * colors.length)];
-        confetti.style.left = Math.random() * 100 + '%';
-        confetti.style.top = '-10px';
-        confetti.style.borderRadius = Math.random() > 0.5 ? '50%' : '0';
-        confetti.style.opacity = '1';
-        confetti.style.zIndex = '9999';
-        confetti.style.pointerEvents = 'none';
-        document.body.appendChild(confetti);
-        
-        const duration = 2000 + Math.random() * 1000;
-        const startTime = Date.now();
-        const xMovement = (Math.random() - 0.5) * 200;
-        
-        function animateConfetti() {
-          const elapsed = Date.now() - startTime;
-          const progress = elapsed / duration;
-          
-          if (progress < 1) {
-            confetti.style.top = (progress * window.innerHeight) + 'px';
-            confetti.style.transform = `translateX(${xMovement * progress}px) rotate(${progress * 720}deg)`;
-            confetti.style.opacity = (1 - progress).toString();
-            requestAnimationFrame(animateConfetti);
-          } else {
-            confetti.remove();
-          }
-        }
-        
-        animateConfetti();
-      }
-    }
-    
-    // Shorten URL
-    async function shorten() {
-      const t = translations[currentLang];
-      const input = document.getElementById('url');
-      const url = input.value.trim();
-      const resultDiv = document.getElementById('result');
-      
-      if (!url) {
-        playSound('error');
-        resultDiv.innerHTML = `<div class="result" style="border-color:var(--danger);background:rgba(239,68,68,.1);">${t.pleaseEnterUrl}</div>`;
-        return;
-      }
-      
-      playSound('click');
-      resultDiv.innerHTML = `<div class="result"><div class="spinner"></div> ${t.processing}</div>`;
-      
-      try {
-        const res = await fetch('/shorten', {
-          method: 'POST',
-          headers: {'Content-Type': 'application/json'},
-          body: JSON.stringify({url})
-        });
-        
-        if (!res.ok) throw new Error(await res.text());
-        
-        const data = await res.json();
-        
-        // Success sound and confetti!
-        playSound('success');
-        createConfetti();
-        
-        let html = '<div class="result">';
-        html += '<div class="result-url">';
-        html += `<strong>${t.shortUrl}</strong>`;
-        html += `<a href="${data.short_url}" target="_blank">${data.short_url}</a>`;
-        html += `<button class="copy-btn" onclick="copyToClipboard('${data.short_url}')">${t.copy}</button>`;
-        html += '</div>';
-        
-        if (data.qr_code) {
-          html += '<div class="qr-container">';
-          html += `<img class="qr" src="data:image/png;base64,${data.qr_code}" alt="QR Code"/>`;
-          html += '</div>';
-        }
-        
-        html += '</div>';
-        resultDiv.innerHTML = html;
-        
-        input.value = '';
-        loadAll();
-      } catch (e) {
-        playSound('error');
-        resultDiv.innerHTML = `<div class="result" style="border-color:var(--danger);background:rgba(239,68,68,.1);">❌ ${t.error}: ${e.message}</div>`;
-      }
-    }
-    
-    // Copy to clipboard
-    async function copyToClipboard(text) {
-      const t = translations[currentLang];
-      try {
-        await navigator.clipboard.writeText(text);
-        playSound('copy');
-        
-        // Visual feedback
-        const btn = event.target;
-        const originalText = btn.innerHTML;
-        btn.innerHTML = t.copied;
-        btn.style.background = 'linear-gradient(135deg, #10b981, #059669)';
-        
-        setTimeout(() => {
-          btn.innerHTML = originalText;
-          btn.style.background = '';
-        }, 2000);
-      } catch (e) {
-        playSound('error');
-        alert(t.copyError);
-      }
-    }
-    
-    // Load all URLs
-    async function loadAll() {
-      const t = translations[currentLang];
-      const listDiv = document.getElementById('list');
-      listDiv.innerHTML = '<div style="text-align:center;padding:20px;"><div class="spinner"></div></div>';
-      
-      try {
-        const res = await fetch('/urls');
-        const data = await res.json();
-        
-        if (!data.length) {
-          listDiv.innerHTML = `
-            <div class="empty-state">
-              <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                <circle cx="12" cy="12" r="10"/>
-                <line x1="12" y1="8" x2="12" y2="12"/>
-                <line x1="12" y1="16" x2="12.01" y2="16"/>
-              </svg>
-              <p>${t.noUrls}<br/>${t.startMessage}</p>
-            </div>
-          `;
-          return;
-        }
-        
-        const locale = currentLang === 'de' ? 'de-DE' : currentLang === 'tr' ? 'tr-TR' : 'en-US';
-        
-        listDiv.innerHTML = data.map(u => `
-          <div class="url-item">
-            <div class="url-info">
-              <div>
-                <span class="url-code">${u.code}</span>
-                <a class="url-link" href="${u.original_url}" target="_blank">${u.original_url}</a>
-              </div>
-              <div class="url-meta">
-                <span class="stats-badge">👆 ${u.clicks} ${t.clicks}</span>
-                <span>📅 ${new Date(u.created_at).toLocaleDateString(locale)}</span>
-              </div>
-            </div>
-            <div class="url-actions">
-              <button class="copy-btn" onclick="copyToClipboard('${window.location.origin}/${u.code}')">📋</button>
-              <button class="btn-danger" onclick="deleteURL(${u.id})">${t.delete}</button>
-            </div>
-          </div>
-        `).join('');
-      } catch (e) {
-        listDiv.innerHTML = `<div class="empty-state">❌ ${t.error}</div>`;
-      }
-    }
-    
-    // Delete URL
-    async function deleteURL(id) {
-      const t = translations[currentLang];
-      if (!confirm(t.deleteConfirm)) return;
-      
-      playSound('click');
-      
-      try {
-        await fetch(`/urls/${id}`, {method: 'DELETE'});
-        playSound('delete');
-        loadAll();
-      } catch (e) {
-        playSound('error');
-        alert(t.deleteError + ': ' + e.message);
-      }
-    }
-    
-    // Initial load
-    loadAll();
-  </script>
+  <script src="{js}"></script>
 </body>
 </html>
 """
 
+class StaticAsset:
+    """Bir kez üretilip gzip/brotli varyantları önceden hazırlanan sabit içerik"""
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.fingerprint = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.variants = {"identity": body, "gzip": gzip.compress(body, 9)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+        # Her kodlama ayrı bir temsil olduğu için ayrı güçlü ETag alır
+        self.etags = {
+            enc: f'"{self.fingerprint}"' if enc == "identity" else f'"{self.fingerprint}-{enc}"'
+            for enc in self.variants
+        }
+
+    def _negotiate(self, accept_encoding: str) -> str:
+        accepted = {}
+        for part in accept_encoding.split(","):
+            name, _, params = part.strip().partition(";")
+            q = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    q = float(params.strip()[2:])
+                except ValueError:
+                    q = 0.0
+            accepted[name.strip().lower()] = q
+        for enc in ("br", "gzip"):
+            if enc in self.variants and accepted.get(enc, accepted.get("*", 0.0)) > 0:
+                return enc
+        return "identity"
+
+    def response(self, request: Request) -> Response:
+        enc = self._negotiate(request.headers.get("accept-encoding", ""))
+        etag = self.etags[enc]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        if enc != "identity":
+            headers["Content-Encoding"] = enc
+        return Response(self.variants[enc], media_type=self.media_type, headers=headers)
+
+def build_assets():
+    """CSS/JS'i parmak izli adlarla, ana sayfayı da bu adlara bağlı olarak hazırlar"""
+    assets = {}
+    for name, media_type in (("app.css", "text/css; charset=utf-8"), ("app.js", "text/javascript; charset=utf-8")):
+        asset = StaticAsset((STATIC_DIR / name).read_bytes(), media_type, "public, max-age=31536000, immutable")
+        stem, ext = name.rsplit(".", 1)
+        assets[f"{stem}.{asset.fingerprint}.{ext}"] = asset
+    urls = {name.split(".")[-1]: f"/static/{name}" for name in assets}
+    html = HOME_TEMPLATE.format(css=urls["css"], js=urls["js"]).encode()
+    # HTML her seferinde ETag ile doğrulanır ki yeni asset adları hemen görülsün
+    return StaticAsset(html, "text/html; charset=utf-8", "no-cache"), assets
+
+home_page, static_assets = build_assets()
+
+@app.get("/", response_class=HTMLResponse)
+def home(request: Request):
+    return home_page.response(request)
+
+@app.get("/static/{name}")
+def static_file(name: str, request: Request):
+    asset = static_assets.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Dosya bulunamadı")
+    return asset.response(request)
+
+
 # ============ API Endpoint'leri ============
-@app.post("/shorten", response_model=ShortenOut)
-def shorten(payload: ShortenIn, request: Request):
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT id FROM urls WHERE original_url = ?", (str(payload.url),))
-        row = cur.fetchone()
-        if row:
-            url_id = row[0]
-        else:
-            cur.execute(
-                "INSERT INTO urls (original_url, created_at, clicks) VALUES (?, ?, 0)",
-                (str(payload.url), datetime.utcnow())
+def _require_primary():
+    if storage.read_only:
+        raise HTTPException(status_code=503, detail="Salt okunur kopya: bu işlem yalnızca birincil sunucuda yapılabilir")
+
+@api.post("/shorten", response_model=ShortenOut)
+async def shorten(payload: ShortenIn, request: Request):
+    profile_handler_entry()
+    _require_primary()
+    url = str(payload.url)
+    expires_at = _expiry(payload)
+    alias = payload.alias
+    if alias is None:
+        url_id = await db.write(storage.get_or_create, url, expires_at, shard=storage.shard_for_url(url))
+        code = encode_id(url_id)
+    else:
+        if not is_alias(alias):
+            raise HTTPException(
+                status_code=400,
+                detail="Takma ad ayrılmış bir yol olamaz; yalnızca harf ve rakamdan oluşan adlar en az 8 karakter olmalı"
             )
-            url_id = cur.lastrowid
-            conn.commit()
-        
-        code = base62(url_id)
-        short_url = f"{request.base_url}{code}"
-        qr = generate_qr(short_url)
-        return ShortenOut(code=code, short_url=short_url, long_url=str(payload.url), qr_code=qr)
+        url_id = await db.write(storage.create_alias, url, alias, expires_at, shard=storage.shard_for_alias(alias))
+        if url_id is None:
+            raise HTTPException(status_code=409, detail="Bu takma ad kullanımda")
+        code = alias
+    short_url = f"{request.base_url}{code}"
+    qr = ""
+    if payload.include_qr:
+        with profile_phase("qr"):
+            qr = await run_in_threadpool(generate_qr, short_url)
+    return ShortenOut(
+        code=code, short_url=short_url, long_url=url,
+        qr_url=f"{short_url}/qr.png", qr_code=qr, expires_at=_iso(expires_at)
+    )
 
-@app.get("/{code}")
-def redirect_url(code: str):
+def _expiry(payload: ShortenIn) -> Optional[float]:
+    if payload.expires_at is not None and payload.ttl is not None:
+        raise HTTPException(status_code=400, detail="expires_at ve ttl birlikte verilemez")
+    now = time.time()
+    if payload.ttl is not None:
+        if payload.ttl > MAX_TTL:
+            raise HTTPException(status_code=400, detail=f"ttl en fazla {MAX_TTL} saniye olabilir")
+        return now + payload.ttl
+    if payload.expires_at is None:
+        return None
+    expires_at = payload.expires_at
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    expires_at = expires_at.timestamp()
+    if expires_at <= now:
+        raise HTTPException(status_code=400, detail="expires_at geçmişte olamaz")
+    # Satır eklenmeden reddedilir; aksi halde _iso listelemede taşardı
+    if expires_at > now + MAX_TTL:
+        raise HTTPException(status_code=400, detail="expires_at en fazla 100 yıl sonrası olabilir")
+    return expires_at
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+
+_http_url = TypeAdapter(HttpUrl)
+
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    """JSON dizisi ya da NDJSON gövdesini URL listesine çevirir"""
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        items = json.loads(body)
+        if not isinstance(items, list):
+            raise ValueError("JSON dizisi bekleniyordu")
+    return [item.get("url") if isinstance(item, dict) else item for item in items]
+
+@api.post("/shorten/bulk")
+async def shorten_bulk(request: Request):
+    _require_primary()
     try:
-        url_id = base62_decode(code)
-    except (ValueError, IndexError):
-        raise HTTPException(status_code=404, detail="Geçersiz kod")
-    
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT original_url FROM urls WHERE id = ?", (url_id,))
-        row = cur.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="URL bulunamadı")
-        
-        # Tıklama sayısını artır
-        cur.execute("UPDATE urls SET clicks = clicks + 1 WHERE id = ?", (url_id,))
-        conn.commit()
-        
-        return RedirectResponse(row[0], status_code=307)
-
-@app.get("/urls", response_model=list[URLDetail])
-def list_urls():
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT id, original_url, created_at, clicks FROM urls ORDER BY created_at DESC")
-        rows = cur.fetchall()
-        return [
-            URLDetail(
-                id=r[0],
-                code=base62(r[0]),
-                original_url=r[1],
-                created_at=r[2],
-                clicks=r[3]
-            ) for r in rows
-        ]
+        items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Geçersiz gövde: {e}")
+    base_url = str(request.base_url)
 
-@app.delete("/urls/{url_id}")
-def delete_url(url_id: int):
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute("DELETE FROM urls WHERE id = ?", (url_id,))
-        if cur.rowcount == 0:
-            raise HTTPException(status_code=404, detail="URL bulunamadı")
-        conn.commit()
+    async def results():
+        # Sonuçlar girdi sırasıyla, chunk chunk NDJSON olarak akıtılır
+        for start in range(0, len(items), BULK_CHUNK_SIZE):
+            chunk = items[start:start + BULK_CHUNK_SIZE]
+            urls = []
+            for item in chunk:
+                try:
+                    urls.append(str(_http_url.validate_python(item)))
+                except ValidationError:
+                    urls.append(None)
+            valid = [url for url in urls if url is not None]
+            # Shard'lar farklı yazıcı thread'lerinde paralel işlenir
+            ids = {}
+            for part in await asyncio.gather(*(
+                db.write(storage.bulk_create, group, shard=shard)
+                for shard, group in storage.partition(valid).items()
+            )):
+                ids.update(part)
+            codes = dict(zip(ids, encode_ids(ids.values())))
+            lines = []
+            for offset, url in enumerate(urls):
+                if url is None:
+                    lines.append({"index": start + offset, "error": "Geçersiz URL"})
+                    continue
+                code = codes[url]
+                lines.append({
+                    "index": start + offset, "code": code,
+                    "short_url": f"{base_url}{code}", "long_url": url,
+                })
+            yield "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@api.get("/urls", response_model=list[URLDetail])
+async def list_urls(
+    request: Request,
+    response: Response,
+    after: Optional[int] = Query(None, ge=0, le=MAX_ID),
+    limit: Optional[int] = Query(None, ge=1),
+    format: str = "json",
+):
+    _require_primary()
+    if format == "ndjson":
+        return StreamingResponse(_stream_urls(after, limit), media_type="application/x-ndjson")
+    
+    limit = min(limit or LIST_PAGE_SIZE, LIST_PAGE_MAX)
+    rows = await db.read(storage.list_page, after, limit)
+    if len(rows) == limit:
+        cursor = rows[-1][0]
+        response.headers["X-Next-Cursor"] = str(cursor)
+        next_url = request.url.include_query_params(after=cursor, limit=limit)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    codes = encode_ids(r[0] for r in rows)
+    return [
+        URLDetail(
+            id=r[0],
+            code=code,
+            original_url=r[1],
+            created_at=r[2],
+            clicks=r[3] + click_buffer.pending(r[0]),
+            expires_at=_iso(r[4]),
+            alias=r[5]
+        ) for r, code in zip(rows, codes)
+    ]
+
+async def _stream_urls(after: Optional[int], limit: Optional[int]):
+    """Satırları parça parça okuyup NDJSON olarak akıtır (Pydantic nesnesi üretmez)"""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        batch = LIST_STREAM_BATCH if remaining is None else min(remaining, LIST_STREAM_BATCH)
+        rows = await db.read(storage.list_page, after, batch)
+        if not rows:
+            return
+        codes = encode_ids(r[0] for r in rows)
+        yield "".join(
+            json.dumps({
+                "id": r[0], "code": code, "original_url": r[1],
+                "created_at": r[2], "clicks": r[3] + click_buffer.pending(r[0]),
+                "expires_at": _iso(r[4]), "alias": r[5],
+            }, ensure_ascii=False) + "\n"
+            for r, code in zip(rows, codes)
+        )
+        after = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < batch:
+            return
+
+@api.delete("/urls/{url_id}")
+async def delete_url(url_id: int):
+    _require_primary()
+    if not await db.write(storage.delete, url_id, shard=storage.shard_for_id(url_id)):
+        raise HTTPException(status_code=404, detail="URL bulunamadı")
+    redirect_cache.invalidate(url_id)
+    click_buffer.discard(url_id)
     return {"message": "Silindi"}
 
+# Varsayılan zaman aralıkları ve tek yanıtta izin verilen en fazla kova sayısı
+STATS_DEFAULT_RANGE = {"minute": timedelta(hours=1), "hour": timedelta(days=1), "day": timedelta(days=30)}
+STATS_MAX_BUCKETS = 10000
+
+def _epoch(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+@api.get("/urls/{url_id}/stats")
+async def url_stats(
+    url_id: int,
+    bucket: str = "hour",
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+):
+    _require_primary()
+    if bucket not in ROLLUP_TABLES:
+        raise HTTPException(status_code=400, detail="bucket minute, hour ya da day olmalı")
+    width = BUCKET_SECONDS[bucket]
+    end = _epoch(to) if to else int(time.time())
+    start = _epoch(from_) if from_ else end - int(STATS_DEFAULT_RANGE[bucket].total_seconds())
+    # Kova sınırlarına hizala; bitiş kovası da dahil
+    start = start // width * width
+    end = end // width * width + width
+    if end <= start or (end - start) // width > STATS_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail="Geçersiz zaman aralığı")
+    rows = await db.read(storage.click_series, url_id, bucket, start, end)
+    if rows is None:
+        raise HTTPException(status_code=404, detail="URL bulunamadı")
+    return {
+        "id": url_id,
+        "bucket": bucket,
+        "from": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+        "to": datetime.fromtimestamp(end, timezone.utc).isoformat(),
+        "total": sum(n for _, n in rows),
+        "series": [
+            {"t": datetime.fromtimestamp(b, timezone.utc).isoformat(), "clicks": n} for b, n in rows
+        ],
+    }
+
+def _negative_stats() -> dict:
+    totals = negative_lookups.totals()
+    rejected = totals.get(("rejected",), 0)
+    false_positive = totals.get(("false_positive",), 0)
+    absent = rejected + false_positive
+    return {
+        "rejected": rejected,
+        "false_positive": false_positive,
+        # Var olmayan id'lerin filtreden geçme oranı
+        "false_positive_rate": false_positive / absent if absent else 0.0,
+    }
+
+@api.get("/stats/cache")
+def cache_stats():
+    return {
+        "redirect": redirect_cache.stats(), "alias": alias_cache.stats(), "qr": qr_cache.stats(),
+        "negative": _negative_stats(),
+    }
+
+@api.get("/stats/storage")
+def storage_stats():
+    return storage.stats()
+
+@api.get("/stats/clicks")
+def click_stats():
+    return {"counters": click_buffer.stats(), "events": click_events.stats()}
+
+def _require_admin(request: Request):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Yetkisiz")
+
+@api.get("/admin/profiles", include_in_schema=False)
+def profile_list(request: Request, route: Optional[str] = None):
+    _require_admin(request)
+    return [p.to_dict() for p in list(profiler.entries) if route is None or p.route == route]
+
+@api.get("/admin/profiles/collapsed", include_in_schema=False)
+def profile_collapsed(request: Request, route: Optional[str] = None):
+    """flamegraph.pl, speedscope veya inferno ile açılabilen collapsed stack çıktısı"""
+    _require_admin(request)
+    return Response(profiler.collapsed(route), media_type="text/plain; charset=utf-8")
+
+def _cache_metrics() -> list:
+    lines = []
+    for name, kind, help in (
+        ("cache_hits_total", "counter", "Önbellek isabetleri"),
+        ("cache_misses_total", "counter", "Önbellek ıskaları"),
+        ("cache_hit_ratio", "gauge", "Önbellek isabet oranı"),
+    ):
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+        key = name.removeprefix("cache_").removesuffix("_total")
+        for cache_name, cache in (("redirect", redirect_cache), ("alias", alias_cache), ("qr", qr_cache)):
+            lines.append(f'{name}{{cache="{cache_name}"}} {cache.stats()[key]}')
+    lines += [
+        "# HELP click_buffer_pending Henüz yazılmamış tıklama sayaçları",
+        "# TYPE click_buffer_pending gauge",
+        f"click_buffer_pending {click_buffer.stats()['pending_clicks']}",
+    ]
+    return lines
 
+metric_collectors.append(_cache_metrics)
+
+def _snapshot_metrics() -> list:
+    stats = storage.stats()
+    lines = []
+    for name, key, help in (
+        ("snapshot_links", "links", "Yüklü snapshot'taki link sayısı"),
+        ("snapshot_bytes", "bytes", "Snapshot'ın bellekte kapladığı yaklaşık bayt"),
+        ("snapshot_load_seconds", "load_seconds", "Son snapshot yükleme süresi"),
+        ("snapshot_generation", "generation", "Başlangıçtan beri yüklenen snapshot sayısı"),
+    ):
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {stats[key]}"]
+    return lines
+
+if STORAGE_BACKEND == "snapshot":
+    metric_collectors.append(_snapshot_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ============ Kısa Link Yönlendirmeleri ============
+# /{code} her şeyi yakaladığı için API'den sonra kaydedilmelidir
+for prefix in API_PREFIXES:
+    app.include_router(api, prefix=prefix, include_in_schema=bool(prefix))
+
+async def _resolve(url_id: int) -> str:
+    """Önbellek -> negatif filtre -> DB sırasıyla hedef URL'yi bulur, yoksa 404, süresi dolmuşsa 410"""
+    # Önbellekte olan kodlar thread'e hiç uğramadan event loop'ta yanıtlanır
+    link = redirect_cache.get(url_id)
+    if link is None:
+        # Var olmadığı kesin olan id'ler (tarayıcılar, botlar) DB'ye hiç gitmez
+        if not storage.might_exist(url_id):
+            negative_lookups.inc("rejected")
+            raise HTTPException(status_code=404, detail="URL bulunamadı")
+        if storage.blocking:
+            link = await db.read(storage.get_by_id, url_id)
+        else:
+            # Bellek içi görüntü event loop'ta, thread'e uğramadan cevaplar
+            link = storage.get_by_id(url_id)
+        if link is None:
+            negative_lookups.inc("false_positive")
+            raise HTTPException(status_code=404, detail="URL bulunamadı")
+        redirect_cache.set(url_id, link)
+    original_url, expires_at = link
+    # Süresi dolan link reaper silene kadar önbellekte kalır ve DB'siz 410 döner
+    if expires_at is not None and expires_at <= time.time():
+        raise HTTPException(status_code=410, detail="Linkin süresi doldu")
+    return original_url
+
+async def _resolve_alias(alias: str) -> tuple:
+    """Takma adı tek bir birincil anahtar aramasıyla id'ye çevirir; (id, hedef URL) döndürür"""
+    url_id = alias_cache.get(alias)
+    if url_id is not None:
+        try:
+            return url_id, await _resolve(url_id)
+        except HTTPException as e:
+            if e.status_code != 404:
+                raise
+            # Link silinmiş, ad başka bir worker'da yeniden alınmış olabilir
+            alias_cache.invalidate(alias)
+    url_id = await db.read(storage.get_alias, alias) if storage.blocking else storage.get_alias(alias)
+    if url_id is None:
+        raise HTTPException(status_code=404, detail="URL bulunamadı")
+    alias_cache.set(alias, url_id)
+    return url_id, await _resolve(url_id)
+
+@app.get("/{code}")
+async def redirect_url(code: str, request: Request):
+    # Sayısal kodlar önce ve ek maliyetsiz çözülür; takma ad araması yalnızca
+    # biçimi sayısal olmayan kodlarda yapılır. Geçersiz kodlar DB'ye gitmeden reddedilir
+    url_id = parse_code(code)
+    if url_id is not None:
+        original_url = await _resolve(url_id)
+    elif is_alias(code):
+        url_id, original_url = await _resolve_alias(code)
+    else:
+        raise HTTPException(status_code=404, detail="Geçersiz kod")
+    
+    # Tıklama sayısı ve olayı bellekte toplanır, arka planda toplu yazılır
+    click_buffer.add(url_id)
+    headers = request.headers
+    click_events.record(url_id, headers.get("referer"), headers.get("user-agent"))
+    return RedirectResponse(original_url, status_code=307)
+
+@app.get("/{code}/qr.{fmt}")
+async def qr_image(code: str, fmt: str, request: Request):
+    if fmt not in QR_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Desteklenmeyen format")
+    url_id = parse_code(code)
+    if url_id is not None:
+        await _resolve(url_id)
+    elif is_alias(code):
+        await _resolve_alias(code)
+    else:
+        raise HTTPException(status_code=404, detail="Geçersiz kod")
+    
+    short_url = f"{request.base_url}{code}"
+    rendered = qr_cache.get((short_url, fmt))
+    if rendered is None:
+        rendered = await run_in_threadpool(_draw_qr, short_url, fmt)
+        if rendered is None:
+            raise HTTPException(status_code=501, detail="QR desteği kurulu değil")
+        qr_cache.set((short_url, fmt), rendered)
+    body, etag = rendered
+    # Kodlar yeniden kullanılmadığı için QR içeriği hiç değişmez
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type=QR_MEDIA_TYPES[fmt], headers=headers)